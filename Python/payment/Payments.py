@@ -15,19 +15,111 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+from matplotlib import cbook
 import numpy as np
 from datetime import datetime, timedelta
 import json
 import csv
+import gzip
 import os
 import sys
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import threading
 import queue
+from pandas.io.parsers import TextParser
+
+try:
+    import openpyxl
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+# Column detection, date parsing and categorization are shared with the web
+# analyzer, which keeps them next to analyze.py
+sys.path.append(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, 'Web', 'PaymentDataAnalysis'
+))
+from statement_normalization import KeywordCategorizer, detect_columns, parse_datetimes, date_report, clean_amounts
 
 # Set matplotlib style
 plt.style.use('default')
 
+# Rows read between progress reports (and cancellation checks) while loading
+LOAD_CHUNK_ROWS = 5000
+# How often the Tk thread drains the loader queue, in milliseconds
+LOAD_POLL_MS = 100
+# Rows written per chunk (and between progress reports) when exporting
+EXPORT_CHUNK_ROWS = 50000
+# Columns exported unless all columns are requested: those in the data table
+EXPORT_COLUMNS = ['DateTime', 'Transaction Details', 'Category', 'Amount', 'Type']
+# Quiet period after the last filter change before stale views are redrawn
+REFRESH_DEBOUNCE_MS = 150
+
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+class LoadCancelled(Exception):
+    """Raised inside a loader or export thread once the user cancels it"""
+
+
+def format_months(datetimes):
+    """dt.strftime('%Y-%m') of a datetime column, formatting each month once"""
+    codes, uniques = pd.factorize(datetimes.dt.to_period('M'))
+    labels = pd.Series(uniques.strftime('%Y-%m'))
+    return labels.reindex(codes).set_axis(datetimes.index)
+
+
+def excel_cell(value):
+    """Normalize an openpyxl cell value the way pandas' Excel reader does"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class AggregateCache:
+    """Chart aggregates memoized per (data version, filter state)
+    
+    Each entry keeps the small groupby results computed for one filtered
+    view, so going back to a recent filter combination skips regrouping
+    the transactions. The oldest view is evicted first.
+    """
+    
+    def __init__(self, max_states=8):
+        self.max_states = max_states
+        self.states = OrderedDict()
+    
+    def get(self, state, name, compute):
+        """Aggregates called name for state, computing them on first use"""
+        entry = self.states.get(state)
+        if entry is None:
+            if len(self.states) >= self.max_states:
+                self.states.popitem(last=False)
+            entry = self.states[state] = {}
+        else:
+            self.states.move_to_end(state)
+        
+        if name not in entry:
+            entry[name] = compute()
+        return entry[name]
+    
+    def clear(self):
+        self.states.clear()
+
 class TransactionAnalyzer:
     """Main Transaction Analyzer Application"""
     
@@ -38,15 +130,48 @@ class TransactionAnalyzer:
         self.root.geometry("1600x1000")
         self.root.configure(bg='#f0f0f0')
         
-        # Data storage
+        # Data storage. df and original_df are the same frame, and so is
+        # filtered_df while no filter is applied; it is never modified in
+        # place, a changed dataset replaces it instead
         self.df = None
         self.filtered_df = None
         self.original_df = None
         
+        # Chart state: aggregates per filter view and artists drawn so far.
+        # data_version changes whenever df is replaced; filter_key is None
+        # while filtered_df is unfiltered
+        self.chart_cache = AggregateCache()
+        self.data_version = 0
+        self.filter_key = None
+        self.quick_artists = {}
+        self.quick_drawn = None
+        self.detailed_drawn = None
+        
+        # Views out of date with filtered_df; each is redrawn once its tab
+        # is visible, by a single debounced refresh
+        self.views = {}
+        self.stale_views = set()
+        self.refresh_job = None
+        
+        # Background file loading and exporting
+        self.loader = None
+        self.loader_cancel = None
+        self.loader_queue = None
+        # Copy of category_keywords the running load categorizes with
+        self.loader_keywords = None
+        self.exporter = None
+        self.export_cancel = None
+        self.export_queue = None
+        
         # UI Components
         self.charts = {}
         self.stats_labels = {}
         
+        # Matcher for category_keywords; its memo is reset when the keywords change
+        self.categorizer = None
+        # Date formats and failed date/time values of the last load
+        self.load_report = None
+        
         # Category keywords for automatic categorization
         self.category_keywords = {
             "🥘 Food & Dining": [
@@ -144,6 +269,15 @@ class TransactionAnalyzer:
         # Status bar
         self.create_status_bar()
         
+        # Views refreshed by update_all_displays, with the tab each lives on
+        self.views = {
+            'statistics': (self.main_tab, self.update_statistics),
+            'quick_charts': (self.main_tab, self.update_quick_charts),
+            'data_table': (self.data_tab, self.update_data_table),
+            'detailed_chart': (self.charts_tab, self.update_detailed_chart),
+        }
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        
     def create_status_bar(self):
         """Create status bar at bottom"""
         self.status_bar = ttk.Frame(self.root)
@@ -155,9 +289,12 @@ class TransactionAnalyzer:
         self.progress = ttk.Progressbar(self.status_bar, length=200, mode='indeterminate')
         self.progress.pack(side='right', padx=(10, 0))
         
+        # Only packed while a file is loading or exporting
+        self.cancel_button = ttk.Button(self.status_bar, text="✖ Cancel", command=self.cancel_task)
+        
     def create_main_tab(self):
         """Create main analysis tab"""
-        main_frame = ttk.Frame(self.notebook)
+        main_frame = self.main_tab = ttk.Frame(self.notebook)
         self.notebook.add(main_frame, text="🏠 Main Dashboard")
         
         # Control panel
@@ -174,8 +311,14 @@ class TransactionAnalyzer:
                   command=self.load_sample_data, style='Accent.TButton').pack(side='left', padx=(0, 10))
         ttk.Button(file_frame, text="💾 Export CSV", 
                   command=self.export_csv).pack(side='left', padx=(0, 10))
+        self.export_all_columns_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(file_frame, text="All columns", 
+                       variable=self.export_all_columns_var).pack(side='left', padx=(0, 10))
         ttk.Button(file_frame, text="📊 Generate Report", 
                   command=self.generate_report).pack(side='left', padx=(0, 10))
+        self.report_summary_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(file_frame, text="Summary only", 
+                       variable=self.report_summary_var).pack(side='left', padx=(0, 10))
         
         # Filters
         filter_frame = ttk.Frame(control_frame)
@@ -281,7 +424,7 @@ class TransactionAnalyzer:
         
     def create_charts_tab(self):
         """Create detailed charts tab"""
-        charts_frame = ttk.Frame(self.notebook)
+        charts_frame = self.charts_tab = ttk.Frame(self.notebook)
         self.notebook.add(charts_frame, text="📊 Detailed Charts")
         
         # Chart controls
@@ -308,7 +451,7 @@ class TransactionAnalyzer:
         
     def create_data_tab(self):
         """Create data view tab"""
-        data_frame = ttk.Frame(self.notebook)
+        data_frame = self.data_tab = ttk.Frame(self.notebook)
         self.notebook.add(data_frame, text="📋 Transaction Data")
         
         # Data controls
@@ -318,14 +461,18 @@ class TransactionAnalyzer:
         ttk.Label(data_controls, text="Show:").pack(side='left', padx=(0, 5))
         self.show_count_var = tk.StringVar(value="100")
         show_counts = ["50", "100", "200", "500", "All"]
-        ttk.Combobox(data_controls, textvariable=self.show_count_var, values=show_counts, 
-                    state='readonly', width=8).pack(side='left', padx=(0, 15))
+        show_combo = ttk.Combobox(data_controls, textvariable=self.show_count_var, values=show_counts, 
+                                  state='readonly', width=8)
+        show_combo.pack(side='left', padx=(0, 15))
+        show_combo.bind('<<ComboboxSelected>>', lambda e: self.update_data_table())
         
         ttk.Label(data_controls, text="Sort by:").pack(side='left', padx=(0, 5))
         self.sort_by_var = tk.StringVar(value="DateTime")
         sort_options = ["DateTime", "Amount", "Category", "Transaction Details"]
-        ttk.Combobox(data_controls, textvariable=self.sort_by_var, values=sort_options, 
-                    state='readonly', width=15).pack(side='left', padx=(0, 15))
+        sort_combo = ttk.Combobox(data_controls, textvariable=self.sort_by_var, values=sort_options, 
+                                  state='readonly', width=15)
+        sort_combo.pack(side='left', padx=(0, 15))
+        sort_combo.bind('<<ComboboxSelected>>', lambda e: self.update_data_table())
         
         ttk.Button(data_controls, text="🔄 Refresh Table", 
                   command=self.update_data_table).pack(side='left', padx=10)
@@ -354,14 +501,36 @@ class TransactionAnalyzer:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=config["width"], anchor=config["anchor"])
         
-        # Scrollbars
-        v_scroll = ttk.Scrollbar(self.tree_frame, orient='vertical', command=self.tree.yview)
+        self.tree.tag_configure('credit', foreground='green')
+        self.tree.tag_configure('debit', foreground='red')
+        
+        # Virtual table: the Treeview only holds the visible rows, which are
+        # refilled from table_order (filtered_df positions in display order)
+        self.table_source = None
+        self.table_sort_by = None
+        self.table_order = None
+        self.table_data = None
+        self.table_rows = 0
+        self.table_offset = 0
+        self.table_visible_rows = 20
+        
+        # Scrollbars; the vertical one scrolls the virtual rows
+        self.table_scroll = ttk.Scrollbar(self.tree_frame, orient='vertical', command=self.scroll_data_table)
         h_scroll = ttk.Scrollbar(self.tree_frame, orient='horizontal', command=self.tree.xview)
-        self.tree.configure(yscrollcommand=v_scroll.set, xscrollcommand=h_scroll.set)
+        self.tree.configure(xscrollcommand=h_scroll.set)
+        
+        self.tree.bind('<MouseWheel>', self.on_table_wheel)
+        self.tree.bind('<Button-4>', self.on_table_wheel)
+        self.tree.bind('<Button-5>', self.on_table_wheel)
+        self.tree.bind('<Prior>', lambda e: self.scroll_data_table('scroll', -1, 'pages'))
+        self.tree.bind('<Next>', lambda e: self.scroll_data_table('scroll', 1, 'pages'))
+        self.tree.bind('<Home>', lambda e: self.scroll_data_table('moveto', 0))
+        self.tree.bind('<End>', lambda e: self.scroll_data_table('moveto', 1))
+        self.tree.bind('<Configure>', self.on_table_resize)
         
         # Pack treeview and scrollbars
         self.tree.pack(fill='both', expand=True)
-        v_scroll.pack(side='right', fill='y')
+        self.table_scroll.pack(side='right', fill='y')
         h_scroll.pack(side='bottom', fill='x')
         
     def create_settings_tab(self):
@@ -406,22 +575,34 @@ class TransactionAnalyzer:
             self.category_text.insert(tk.END, f"{category}:\n")
             self.category_text.insert(tk.END, f"  {', '.join(keywords)}\n\n")
     
+    def keyword_categorizer(self):
+        """KeywordCategorizer for the current category_keywords"""
+        # Saving or importing categories replaces the dict; in-place edits
+        # are picked up by the categorizer itself
+        if self.categorizer is None or self.categorizer.category_keywords is not self.category_keywords:
+            self.categorizer = KeywordCategorizer(self.category_keywords)
+        return self.categorizer
+    
     def categorize_transaction(self, details):
         """Categorize a transaction based on keywords"""
-        if pd.isna(details) or str(details).strip() == '':
-            return "🔄 Miscellaneous"
-        
-        details_lower = str(details).lower().strip()
-        
-        for category, keywords in self.category_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in details_lower:
-                    return category
-        
-        return "🔄 Miscellaneous"
+        return self.keyword_categorizer().categorize(details)
+    
+    def categorize_series(self, details, categorizer=None):
+        """Categorize a whole details column, once per distinct string
+        
+        Uses categorizer when given, else the one for the current keywords.
+        The result is categorical with its categories sorted, so sorting by
+        it still orders rows alphabetically by label.
+        """
+        categorizer = categorizer or self.keyword_categorizer()
+        return categorizer.categorize_series(details).astype('category').rename('Category')
     
     def load_file(self):
         """Load Excel file"""
+        if self.loader is not None or self.exporter is not None:
+            self.update_status("Another file operation is running - cancel it first")
+            return
+        
         file_path = filedialog.askopenfilename(
             title="Select Excel File",
             filetypes=[
@@ -434,103 +615,241 @@ class TransactionAnalyzer:
         if not file_path:
             return
         
+        # Reading and processing run on a worker thread so the window keeps
+        # repainting; results come back through the queue polled below. The
+        # worker gets its own copy of the keywords, since the settings tab
+        # may change them while it runs
+        self.loader_keywords = {category: list(keywords) for category, keywords in self.category_keywords.items()}
+        self.loader_cancel = threading.Event()
+        self.loader_queue = queue.Queue()
+        self.loader = threading.Thread(
+            target=self.load_worker,
+            args=(file_path, self.loader_keywords, self.loader_cancel, self.loader_queue),
+            daemon=True
+        )
+        
+        self.update_status("Loading file...")
+        self.progress.config(mode='determinate', maximum=100, value=0)
+        self.cancel_button.pack(side='right', padx=(10, 0))
+        
+        self.loader.start()
+        self.root.after(LOAD_POLL_MS, self.poll_loader)
+    
+    def load_worker(self, file_path, category_keywords, cancel, messages):
+        """Read and process a statement off the Tk thread
+        
+        Categorizes with a KeywordCategorizer of its own for category_keywords,
+        so no categorization state is shared with the Tk thread. Posts
+        (kind, value, extra) tuples to messages: 'progress' with the rows
+        read and the fraction done, 'processing' with the row count, then
+        exactly one of 'done' (with the frame and its date report),
+        'cancelled' or 'error'.
+        """
+        def report(rows, fraction):
+            if cancel.is_set():
+                raise LoadCancelled()
+            messages.put(('progress', rows, fraction))
+        
         try:
-            self.update_status("Loading file...")
-            self.progress.start(10)
-            
             # Load file based on extension
             if file_path.lower().endswith('.csv'):
-                self.df = pd.read_csv(file_path)
+                df = self.read_csv_chunks(file_path, report)
             else:
-                self.df = pd.read_excel(file_path, engine='openpyxl')
+                df = self.read_excel_rows(file_path, report)
             
-            # Process the loaded data
-            self.process_data()
+            messages.put(('processing', len(df), None))
+            df, load_report = self.prepare_frame(df, KeywordCategorizer(category_keywords))
+            if cancel.is_set():
+                raise LoadCancelled()
             
-            self.update_status(f"Successfully loaded {len(self.df)} transactions")
-            messagebox.showinfo("Success", f"Successfully loaded {len(self.df)} transactions!")
+            messages.put(('done', (df, load_report), file_path))
+        
+        except LoadCancelled:
+            messages.put(('cancelled', None, None))
+        
+        except Exception as e:
+            messages.put(('error', str(e), None))
+    
+    @staticmethod
+    def read_csv_chunks(file_path, report):
+        """Read a CSV in chunks, reporting progress by bytes consumed"""
+        total = os.path.getsize(file_path) or 1
+        chunks = []
+        rows = 0
+        
+        with open(file_path, 'rb') as handle:
+            with pd.read_csv(handle, chunksize=LOAD_CHUNK_ROWS) as reader:
+                for chunk in reader:
+                    chunks.append(chunk)
+                    rows += len(chunk)
+                    report(rows, min(handle.tell() / total, 1.0))
+        
+        if not chunks:
+            # Header-only file: let pandas build the empty frame
+            return pd.read_csv(file_path)
+        return pd.concat(chunks, ignore_index=True)
+    
+    @staticmethod
+    def read_excel_rows(file_path, report):
+        """Stream the first sheet row by row, reporting progress by rows read
+        
+        The collected rows go through the same parser read_excel uses, so
+        column types come out as they did with a plain read_excel call.
+        """
+        if not HAS_OPENPYXL or not file_path.lower().endswith(('.xlsx', '.xlsm')):
+            df = pd.read_excel(file_path, engine='openpyxl')
+            report(len(df), 1.0)
+            return df
+        
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            total = max((sheet.max_row or 0) - 1, 1)
+            rows = []
+            for values in sheet.iter_rows(values_only=True):
+                rows.append([excel_cell(value) for value in values])
+                if len(rows) % LOAD_CHUNK_ROWS == 0:
+                    report(len(rows) - 1, min((len(rows) - 1) / total, 1.0))
+        finally:
+            workbook.close()
+        
+        # Trailing blank rows are dropped, as read_excel does
+        while rows and all(value == '' for value in rows[-1]):
+            rows.pop()
+        if not rows:
+            return pd.DataFrame()
+        
+        report(len(rows) - 1, 1.0)
+        return TextParser(rows, header=0).read()
+    
+    def poll_loader(self):
+        """Apply queued loader messages on the Tk thread until the load ends"""
+        try:
+            while True:
+                kind, value, extra = self.loader_queue.get_nowait()
+                if kind == 'progress':
+                    self.progress.config(value=extra * 100)
+                    self.update_status(f"Loading file... {value:,} rows read")
+                elif kind == 'processing':
+                    self.progress.config(mode='indeterminate')
+                    self.progress.start(10)
+                    self.update_status(f"Processing {value:,} transactions...")
+                else:
+                    self.finish_load(kind, value, extra)
+                    return
+        except queue.Empty:
+            pass
+        
+        self.root.after(LOAD_POLL_MS, self.poll_loader)
+    
+    def finish_load(self, kind, value, file_path):
+        """Swap in a finished load, or report why it stopped"""
+        self.loader = None
+        self.loader_keywords = None
+        self.progress.stop()
+        self.progress.config(mode='determinate', value=0)
+        self.cancel_button.pack_forget()
+        
+        if kind == 'done':
+            df, self.load_report = value
+            # Categories saved or imported during the load apply to it too
+            if self.category_keywords != self.loader_keywords:
+                df = df.assign(Category=self.categorize_series(df['Transaction Details']))
             
-            self.reset_filters()
+            # All three references change together, so no display ever sees
+            # a mix of the old and the new statement
+            self.df = self.original_df = self.filtered_df = df
+            self.data_changed()
             
-        except Exception as e:
-            self.update_status("Error loading file")
-            messagebox.showerror("Error", f"Failed to load file:\n{str(e)}")
+            message = f"Successfully loaded {len(self.df)} transactions!"
+            failed = self.load_report["failed_rows"]
+            if failed:
+                self.update_status(f"Loaded {len(self.df)} transactions, {failed} date/time values could not be parsed")
+                message += (f"\n\n{failed} date/time values could not be parsed and were left empty, "
+                            f"e.g. {', '.join(self.load_report['examples'][:3])}")
+            else:
+                self.update_status(f"Successfully loaded {len(self.df)} transactions")
+            messagebox.showinfo("Success", message)
+            
+            self.reset_filters()
         
-        finally:
-            self.progress.stop()
+        elif kind == 'cancelled':
+            self.update_status("Loading cancelled")
+        
+        else:
+            self.update_status("Error loading file")
+            messagebox.showerror("Error", f"Failed to load file:\n{value}")
+    
+    def cancel_task(self):
+        """Ask the running loader or exporter thread to stop at its next progress check"""
+        for worker, cancel in ((self.loader, self.loader_cancel), (self.exporter, self.export_cancel)):
+            if worker is not None:
+                cancel.set()
+                self.update_status("Cancelling...")
     
     def process_data(self):
         """Process loaded data"""
         if self.df is None:
             return
         
+        self.df, self.load_report = self.prepare_frame(self.df)
+        self.data_changed()
+        
+        # Store original for reset
+        self.original_df = self.filtered_df = self.df
+    
+    def prepare_frame(self, df, categorizer=None):
+        """Derive the analysis columns for a raw statement frame
+        
+        Columns are found, and dates, times and amounts parsed, the same way
+        as in the web analyzer. Returns the frame and its date report
+        (detected formats, failed_rows and a few unparseable examples).
+        Categories come from categorizer, by default the one for the current
+        keywords; the loader thread passes its own, so it touches no Tk or
+        shared categorization state.
+        """
+        df.columns = df.columns.astype(str).str.strip()
+        columns = detect_columns(df)
+        
         # Handle DateTime columns
-        if 'Date' in self.df.columns and 'Time' in self.df.columns:
-            # Combine Date and Time
-            try:
-                self.df['DateTime'] = pd.to_datetime(
-                    self.df['Date'].astype(str) + ' ' + self.df['Time'].astype(str), 
-                    errors='coerce'
-                )
-            except:
-                self.df['DateTime'] = pd.to_datetime(self.df['Date'], errors='coerce')
-        elif 'Date' in self.df.columns:
-            self.df['DateTime'] = pd.to_datetime(self.df['Date'], errors='coerce')
-        elif 'DateTime' in self.df.columns:
-            self.df['DateTime'] = pd.to_datetime(self.df['DateTime'], errors='coerce')
-        else:
+        datetimes = parse_datetimes(df, columns)
+        if datetimes is None:
             # Create dummy dates
-            base_date = datetime.now() - timedelta(days=len(self.df))
-            self.df['DateTime'] = [base_date + timedelta(days=i) for i in range(len(self.df))]
-        
-        # Handle Amount column
-        amount_col = None
-        for col in self.df.columns:
-            if 'amount' in col.lower():
-                amount_col = col
-                break
-        
-        if amount_col:
-            # Clean and convert amount
-            self.df['Amount'] = pd.to_numeric(
-                self.df[amount_col].astype(str).str.replace(r'[₹,$,\s]', '', regex=True),
-                errors='coerce'
-            ).fillna(0)
+            base_date = datetime.now() - timedelta(days=len(df))
+            datetimes = pd.Series([base_date + timedelta(days=i) for i in range(len(df))], index=df.index)
+        df['DateTime'] = datetimes
+        
+        if columns['amount'] is not None:
+            df['Amount'] = clean_amounts(df[columns['amount']])
         else:
-            self.df['Amount'] = 0
-        
-        # Handle Transaction Details
-        details_col = None
-        for col in self.df.columns:
-            if 'transaction' in col.lower() and 'detail' in col.lower():
-                details_col = col
-                break
-        
-        if not details_col:
-            # Look for any text column that might contain transaction info
-            text_cols = [col for col in self.df.columns if self.df[col].dtype == 'object']
-            if text_cols:
-                details_col = text_cols[0]
-        
-        if details_col:
-            self.df['Transaction Details'] = self.df[details_col].fillna('Unknown Transaction')
+            df['Amount'] = 0
+        
+        if columns['details'] is not None:
+            df['Transaction Details'] = df[columns['details']].fillna('Unknown Transaction')
         else:
-            self.df['Transaction Details'] = 'Unknown Transaction'
+            df['Transaction Details'] = 'Unknown Transaction'
         
         # Add derived columns
-        self.df['Category'] = self.df['Transaction Details'].apply(self.categorize_transaction)
-        self.df['Type'] = self.df['Amount'].apply(lambda x: 'Credit' if x > 0 else 'Debit')
-        self.df['AbsAmount'] = self.df['Amount'].abs()
+        df['Category'] = self.categorize_series(df['Transaction Details'], categorizer)
+        df['Type'] = self.transaction_types(df['Amount'])
+        df['AbsAmount'] = df['Amount'].abs()
         
         # Add time-based columns
-        self.df['Date'] = self.df['DateTime'].dt.date
-        self.df['DayOfWeek'] = self.df['DateTime'].dt.day_name()
-        self.df['Month'] = self.df['DateTime'].dt.strftime('%Y-%m')
-        self.df['WeekOfYear'] = self.df['DateTime'].dt.isocalendar().week
+        df['Date'] = df['DateTime'].dt.date
+        df['DayOfWeek'] = df['DateTime'].dt.day_name()
+        df['Month'] = format_months(df['DateTime'])
+        df['WeekOfYear'] = df['DateTime'].dt.isocalendar().week
         
-        # Store original for reset
-        self.original_df = self.df.copy()
-        self.filtered_df = self.df.copy()
+        return df, date_report(columns)
+    
+    @staticmethod
+    def transaction_types(amounts):
+        """'Credit' for positive amounts, 'Debit' otherwise, as a categorical"""
+        codes = np.where(amounts.to_numpy() > 0, 0, 1)
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=['Credit', 'Debit']),
+            index=amounts.index, name='Type'
+        )
     
     def generate_sample_data(self):
         """Generate sample transaction data"""
@@ -653,10 +972,11 @@ class TransactionAnalyzer:
         self.sample_df = pd.DataFrame(transactions)
         
         # Add derived columns
-        self.sample_df['Type'] = self.sample_df['Amount'].apply(lambda x: 'Credit' if x > 0 else 'Debit')
+        self.sample_df['Category'] = self.sample_df['Category'].astype('category')
+        self.sample_df['Type'] = self.transaction_types(self.sample_df['Amount'])
         self.sample_df['AbsAmount'] = self.sample_df['Amount'].abs()
         self.sample_df['DayOfWeek'] = self.sample_df['DateTime'].dt.day_name()
-        self.sample_df['Month'] = self.sample_df['DateTime'].dt.strftime('%Y-%m')
+        self.sample_df['Month'] = format_months(self.sample_df['DateTime'])
         self.sample_df['WeekOfYear'] = self.sample_df['DateTime'].dt.isocalendar().week
         
     def load_sample_data(self):
@@ -664,9 +984,8 @@ class TransactionAnalyzer:
         if not hasattr(self, 'sample_df'):
             self.generate_sample_data()
         
-        self.df = self.sample_df.copy()
-        self.original_df = self.df.copy()
-        self.filtered_df = self.df.copy()
+        self.df = self.original_df = self.filtered_df = self.sample_df
+        self.data_changed()
         
         self.update_status(f"Loaded {len(self.df)} sample transactions")
         messagebox.showinfo("Sample Data", f"Loaded {len(self.df)} sample transactions!")
@@ -680,7 +999,8 @@ class TransactionAnalyzer:
             return
         
         try:
-            filtered_df = self.df.copy()
+            # Each mask selects into a new frame, so df itself is never touched
+            filtered_df = self.df
             
             # Amount filters
             if self.min_amount_var.get():
@@ -703,6 +1023,10 @@ class TransactionAnalyzer:
                 ]
             
             self.filtered_df = filtered_df
+            self.filter_key = (
+                self.min_amount_var.get(), self.max_amount_var.get(),
+                self.category_var.get(), self.search_var.get().lower()
+            )
             
             # Update displays
             self.update_all_displays()
@@ -732,7 +1056,8 @@ class TransactionAnalyzer:
             self.category_combo.current(0)
         
         # Reset filtered data
-        self.filtered_df = self.df.copy()
+        self.filtered_df = self.df
+        self.filter_key = None
         
         # Update all displays
         self.update_all_displays()
@@ -744,10 +1069,47 @@ class TransactionAnalyzer:
         if self.filtered_df is None:
             return
         
-        self.update_statistics()
-        self.update_quick_charts()
-        self.update_data_table()
-        self.update_detailed_chart()
+        self.stale_views.update(self.views)
+        self.schedule_refresh()
+    
+    def data_changed(self):
+        """Forget chart aggregates after df was replaced or recategorized"""
+        self.data_version += 1
+        self.chart_cache.clear()
+    
+    def view_key(self):
+        """Identity of the data currently in filtered_df"""
+        return (self.data_version, self.filter_key)
+    
+    def aggregate(self, name, compute, df):
+        """Cached compute(df) for the current filter view"""
+        return self.chart_cache.get(self.view_key(), name, lambda: compute(df))
+    
+    def schedule_refresh(self):
+        """Refresh the visible stale views once filter changes have settled
+        
+        Requests arriving while one is pending replace it, so a burst of
+        changes costs a single redraw.
+        """
+        if self.refresh_job is not None:
+            self.root.after_cancel(self.refresh_job)
+        self.refresh_job = self.root.after(REFRESH_DEBOUNCE_MS, self.refresh_visible)
+    
+    def refresh_visible(self):
+        """Render the stale views on the selected tab; others wait for theirs"""
+        self.refresh_job = None
+        current = self.notebook.select()
+        
+        for view, (tab, render) in self.views.items():
+            if view in self.stale_views and str(tab) == current:
+                self.stale_views.discard(view)
+                render()
+    
+    def on_tab_changed(self, event=None):
+        """Bring the newly selected tab up to date straight away"""
+        if self.refresh_job is not None:
+            self.root.after_cancel(self.refresh_job)
+        self.refresh_visible()
     
     def update_statistics(self):
         """Update statistics display"""
@@ -797,28 +1159,63 @@ class TransactionAnalyzer:
         self.stats_labels['top_category'].config(text=top_category)
         self.stats_labels['date_range'].config(text=date_range)
     
+    @staticmethod
+    def quick_aggregates(df):
+        """Everything the overview charts plot, from one debit split"""
+        debit_data = df[df['Amount'] < 0]
+        
+        dow_data = debit_data.groupby('DayOfWeek')['AbsAmount'].sum()
+        dow_data = dow_data.reindex([day for day in DAY_ORDER if day in dow_data.index])
+        
+        return {
+            'categories': debit_data.groupby('Category', observed=True)['AbsAmount'].sum(),
+            'daily': debit_data.groupby('Date')['AbsAmount'].sum().sort_index(),
+            'dow': dow_data,
+            # Count of debit transactions per month
+            'monthly': (df['Amount'] < 0).groupby(df['Month']).sum(),
+        }
+    
+    def resize_bars(self, ax, name, labels, values):
+        """Set new heights on a drawn bar panel; False if it must be rebuilt"""
+        drawn = self.quick_artists.get(name)
+        if drawn is None or drawn[0] != labels:
+            return False
+        
+        for bar, value in zip(drawn[1], values):
+            bar.set_height(value)
+        ax.relim()
+        ax.autoscale_view()
+        return True
+    
     def update_quick_charts(self):
-        """Update quick analysis charts"""
+        """Update quick analysis charts
+        
+        Panels whose categories are unchanged keep their artists and only
+        get new data; the rest are rebuilt from the cached aggregates.
+        """
         if self.filtered_df is None or len(self.filtered_df) == 0:
             # Clear all charts
             for ax in [self.ax_category, self.ax_trends, self.ax_dow, self.ax_monthly]:
                 ax.clear()
                 ax.text(0.5, 0.5, 'No Data', ha='center', va='center', transform=ax.transAxes)
-            self.canvas_quick.draw()
+            self.quick_artists = {}
+            self.quick_drawn = None
+            self.canvas_quick.draw_idle()
             return
         
-        df = self.filtered_df
+        state = self.view_key()
+        if state == self.quick_drawn:
+            return
         
-        # Clear all axes
-        self.ax_category.clear()
-        self.ax_trends.clear()
-        self.ax_dow.clear()
-        self.ax_monthly.clear()
+        data = self.aggregate('quick', self.quick_aggregates, self.filtered_df)
+        rebuilt = False
         
-        # 1. Category pie chart (spending only)
-        debit_data = df[df['Amount'] < 0]
-        if len(debit_data) > 0:
-            category_data = debit_data.groupby('Category')['AbsAmount'].sum()
+        # 1. Category pie chart (spending only); wedges can't be resized, so
+        # the pie is only redrawn when its totals actually changed
+        category_data = data['categories']
+        drawn = self.quick_artists.get('category')
+        if drawn is None or not drawn.equals(category_data):
+            self.ax_category.clear()
             if len(category_data) > 0:
                 colors = plt.cm.Set3(np.linspace(0, 1, len(category_data)))
                 wedges, texts, autotexts = self.ax_category.pie(
@@ -833,58 +1230,73 @@ class TransactionAnalyzer:
                     text.set_fontsize(8)
                 for autotext in autotexts:
                     autotext.set_fontsize(7)
-        
-        self.ax_category.set_title("💸 Spending by Category", fontsize=10)
+            
+            self.ax_category.set_title("💸 Spending by Category", fontsize=10)
+            self.quick_artists['category'] = category_data
         
         # 2. Daily spending trends
-        if len(debit_data) > 0:
-            daily_spending = debit_data.groupby('Date')['AbsAmount'].sum().sort_index()
+        daily_spending = data['daily']
+        line = self.quick_artists.get('trends')
+        if line is not None and len(daily_spending) > 0:
+            line.set_data(daily_spending.index, daily_spending.values)
+            self.ax_trends.relim()
+            self.ax_trends.autoscale_view()
+        else:
+            self.ax_trends.clear()
+            line = None
             if len(daily_spending) > 0:
-                self.ax_trends.plot(daily_spending.index, daily_spending.values, 
-                                   marker='o', linewidth=1, markersize=3, color='#2E86AB')
+                line, = self.ax_trends.plot(daily_spending.index, daily_spending.values, 
+                                            marker='o', linewidth=1, markersize=3, color='#2E86AB')
                 self.ax_trends.tick_params(axis='x', rotation=45, labelsize=8)
                 self.ax_trends.tick_params(axis='y', labelsize=8)
-        
-        self.ax_trends.set_title("📈 Daily Spending Trends", fontsize=10)
-        self.ax_trends.grid(True, alpha=0.3)
+            
+            self.ax_trends.set_title("📈 Daily Spending Trends", fontsize=10)
+            self.ax_trends.grid(True, alpha=0.3)
+            self.quick_artists['trends'] = line
+            rebuilt = True
         
         # 3. Day of week spending
-        if len(debit_data) > 0:
-            dow_data = debit_data.groupby('DayOfWeek')['AbsAmount'].sum()
-            # Reorder days
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            dow_data = dow_data.reindex([day for day in day_order if day in dow_data.index])
-            
+        dow_data = data['dow']
+        days = list(dow_data.index)
+        if not self.resize_bars(self.ax_dow, 'dow', days, dow_data.values):
+            self.ax_dow.clear()
+            bars = []
             if len(dow_data) > 0:
                 colors = plt.cm.Pastel1(np.linspace(0, 1, len(dow_data)))
-                self.ax_dow.bar(range(len(dow_data)), dow_data.values, color=colors)
+                bars = self.ax_dow.bar(range(len(dow_data)), dow_data.values, color=colors)
                 self.ax_dow.set_xticks(range(len(dow_data)))
-                self.ax_dow.set_xticklabels([day[:3] for day in dow_data.index], fontsize=8)
+                self.ax_dow.set_xticklabels([day[:3] for day in days], fontsize=8)
                 self.ax_dow.tick_params(axis='y', labelsize=8)
-        
-        self.ax_dow.set_title("📅 Spending by Day of Week", fontsize=10)
-        self.ax_dow.grid(True, alpha=0.3, axis='y')
+            
+            self.ax_dow.set_title("📅 Spending by Day of Week", fontsize=10)
+            self.ax_dow.grid(True, alpha=0.3, axis='y')
+            self.quick_artists['dow'] = (days, bars)
+            rebuilt = True
         
         # 4. Monthly overview
-        if len(df) > 0:
-            monthly_data = df.groupby('Month').agg({
-                'Amount': lambda x: len(x[x < 0])  # Count of debit transactions
-            })
-            
+        monthly_data = data['monthly']
+        months = list(monthly_data.index)
+        if not self.resize_bars(self.ax_monthly, 'monthly', months, monthly_data.values):
+            self.ax_monthly.clear()
+            bars = []
             if len(monthly_data) > 0:
                 colors = plt.cm.Set2(np.linspace(0, 1, len(monthly_data)))
-                self.ax_monthly.bar(range(len(monthly_data)), monthly_data['Amount'].values, color=colors)
+                bars = self.ax_monthly.bar(range(len(monthly_data)), monthly_data.values, color=colors)
                 self.ax_monthly.set_xticks(range(len(monthly_data)))
-                self.ax_monthly.set_xticklabels(monthly_data.index, rotation=45, fontsize=8)
+                self.ax_monthly.set_xticklabels(months, rotation=45, fontsize=8)
                 self.ax_monthly.tick_params(axis='y', labelsize=8)
-        
-        self.ax_monthly.set_title("📊 Transaction Count by Month", fontsize=10)
-        self.ax_monthly.grid(True, alpha=0.3, axis='y')
-        
-        # Adjust layout and refresh
-        self.fig_quick.suptitle('Transaction Analysis Overview', fontsize=12, fontweight='bold')
-        plt.tight_layout()
-        self.canvas_quick.draw()
+            
+            self.ax_monthly.set_title("📊 Transaction Count by Month", fontsize=10)
+            self.ax_monthly.grid(True, alpha=0.3, axis='y')
+            self.quick_artists['monthly'] = (months, bars)
+            rebuilt = True
+        
+        # Layout only has to be recomputed when tick labels may have changed
+        if rebuilt:
+            self.fig_quick.suptitle('Transaction Analysis Overview', fontsize=12, fontweight='bold')
+            self.fig_quick.tight_layout()
+        self.canvas_quick.draw_idle()
+        self.quick_drawn = state
     
     def update_detailed_chart(self, event=None):
         """Update detailed chart based on selected type"""
@@ -892,12 +1304,18 @@ class TransactionAnalyzer:
             self.fig_detailed.clear()
             ax = self.fig_detailed.add_subplot(111)
             ax.text(0.5, 0.5, 'No Data Available', ha='center', va='center', transform=ax.transAxes)
-            self.canvas_detailed.draw()
+            self.detailed_drawn = None
+            self.canvas_detailed.draw_idle()
             return
         
         chart_type = self.chart_type_var.get()
         df = self.filtered_df
         
+        # Nothing to do if this chart already shows this filter view
+        state = (chart_type,) + self.view_key()
+        if state == self.detailed_drawn:
+            return
+        
         self.fig_detailed.clear()
         
         if chart_type == "Category Analysis":
@@ -909,13 +1327,27 @@ class TransactionAnalyzer:
         elif chart_type == "Merchant Analysis":
             self.create_merchant_analysis_chart(df)
         
-        self.canvas_detailed.draw()
+        self.canvas_detailed.draw_idle()
+        self.detailed_drawn = state
+    
+    @staticmethod
+    def category_aggregates(df):
+        """Per-category totals, counts and averages of spending in one groupby"""
+        debit_data = df[df['Amount'] < 0]
+        stats = debit_data.groupby('Category', observed=True)['AbsAmount'].agg(['sum', 'size', 'mean'])
+        
+        return {
+            'debits': len(debit_data),
+            'totals': stats['sum'].sort_values(ascending=False),
+            'counts': stats['size'].sort_values(ascending=False).head(10),
+            'averages': stats['mean'].sort_values(ascending=False).head(10),
+        }
     
     def create_category_analysis_chart(self, df):
         """Create detailed category analysis"""
-        debit_data = df[df['Amount'] < 0]
+        data = self.aggregate('category', self.category_aggregates, df)
         
-        if len(debit_data) == 0:
+        if data['debits'] == 0:
             ax = self.fig_detailed.add_subplot(111)
             ax.text(0.5, 0.5, 'No Spending Data Available', ha='center', va='center')
             return
@@ -927,7 +1359,7 @@ class TransactionAnalyzer:
         ax4 = self.fig_detailed.add_subplot(2, 2, 4)
         
         # 1. Category pie chart
-        category_totals = debit_data.groupby('Category')['AbsAmount'].sum().sort_values(ascending=False)
+        category_totals = data['totals']
         colors = plt.cm.Set3(np.linspace(0, 1, len(category_totals)))
         ax1.pie(category_totals.values, labels=category_totals.index, autopct='%1.1f%%', 
                 colors=colors, startangle=90)
@@ -943,7 +1375,7 @@ class TransactionAnalyzer:
         ax2.set_xlabel('Amount (₹)')
         
         # 3. Category vs count
-        category_counts = debit_data.groupby('Category').size().sort_values(ascending=False).head(10)
+        category_counts = data['counts']
         ax3.bar(range(len(category_counts)), category_counts.values,
                 color=plt.cm.Set2(np.linspace(0, 1, len(category_counts))))
         ax3.set_xticks(range(len(category_counts)))
@@ -953,7 +1385,7 @@ class TransactionAnalyzer:
         ax3.set_ylabel('Number of Transactions')
         
         # 4. Average amount by category
-        avg_amounts = debit_data.groupby('Category')['AbsAmount'].mean().sort_values(ascending=False).head(10)
+        avg_amounts = data['averages']
         ax4.bar(range(len(avg_amounts)), avg_amounts.values,
                 color=plt.cm.Pastel2(np.linspace(0, 1, len(avg_amounts))))
         ax4.set_xticks(range(len(avg_amounts)))
@@ -963,7 +1395,23 @@ class TransactionAnalyzer:
         ax4.set_ylabel('Average Amount (₹)')
         
         self.fig_detailed.suptitle('Detailed Category Analysis', fontsize=16, fontweight='bold')
-        plt.tight_layout()
+        self.fig_detailed.tight_layout()
+    
+    @staticmethod
+    def time_aggregates(df):
+        """Daily, monthly, weekday and hourly spending"""
+        debit_data = df[df['Amount'] < 0]
+        
+        weekly_spending = debit_data.groupby('DayOfWeek')['AbsAmount'].sum()
+        weekly_spending = weekly_spending.reindex([day for day in DAY_ORDER if day in weekly_spending.index])
+        
+        return {
+            'debits': len(debit_data),
+            'daily': debit_data.groupby('Date')['AbsAmount'].sum().sort_index(),
+            'monthly': debit_data.groupby('Month')['AbsAmount'].sum().sort_index(),
+            'weekly': weekly_spending,
+            'hourly': debit_data.groupby(debit_data['DateTime'].dt.hour)['AbsAmount'].sum(),
+        }
     
     def create_time_trends_chart(self, df):
         """Create detailed time trends analysis"""
@@ -972,17 +1420,19 @@ class TransactionAnalyzer:
             ax.text(0.5, 0.5, 'No Data Available', ha='center', va='center')
             return
         
+        data = self.aggregate('time', self.time_aggregates, df)
+        
         # Create 2x2 subplot
         ax1 = self.fig_detailed.add_subplot(2, 2, 1)
         ax2 = self.fig_detailed.add_subplot(2, 2, 2)
         ax3 = self.fig_detailed.add_subplot(2, 2, 3)
         ax4 = self.fig_detailed.add_subplot(2, 2, 4)
         
-        debit_data = df[df['Amount'] < 0]
+        has_debits = data['debits'] > 0
         
         # 1. Daily spending trend
-        if len(debit_data) > 0:
-            daily_spending = debit_data.groupby('Date')['AbsAmount'].sum().sort_index()
+        if has_debits:
+            daily_spending = data['daily']
             ax1.plot(daily_spending.index, daily_spending.values, marker='o', linewidth=2, markersize=4)
             ax1.set_title('Daily Spending Trend')
             ax1.set_ylabel('Amount (₹)')
@@ -990,8 +1440,8 @@ class TransactionAnalyzer:
             ax1.grid(True, alpha=0.3)
         
         # 2. Monthly spending
-        if len(debit_data) > 0:
-            monthly_spending = debit_data.groupby('Month')['AbsAmount'].sum().sort_index()
+        if has_debits:
+            monthly_spending = data['monthly']
             ax2.bar(range(len(monthly_spending)), monthly_spending.values,
                    color=plt.cm.Blues(np.linspace(0.3, 1, len(monthly_spending))))
             ax2.set_xticks(range(len(monthly_spending)))
@@ -1000,11 +1450,8 @@ class TransactionAnalyzer:
             ax2.set_ylabel('Amount (₹)')
         
         # 3. Weekly pattern
-        if len(debit_data) > 0:
-            weekly_spending = debit_data.groupby('DayOfWeek')['AbsAmount'].sum()
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            weekly_spending = weekly_spending.reindex([day for day in day_order if day in weekly_spending.index])
-            
+        if has_debits:
+            weekly_spending = data['weekly']
             ax3.bar(range(len(weekly_spending)), weekly_spending.values,
                    color=plt.cm.Greens(np.linspace(0.3, 1, len(weekly_spending))))
             ax3.set_xticks(range(len(weekly_spending)))
@@ -1012,24 +1459,54 @@ class TransactionAnalyzer:
             ax3.set_title('Weekly Spending Pattern')
             ax3.set_ylabel('Amount (₹)')
         
-        # 4. Hourly pattern (if time data available)
-        if 'DateTime' in df.columns:
-            df_with_hour = df.copy()
-            df_with_hour['Hour'] = df_with_hour['DateTime'].dt.hour
-            debit_hourly = df_with_hour[df_with_hour['Amount'] < 0]
-            
-            if len(debit_hourly) > 0:
-                hourly_spending = debit_hourly.groupby('Hour')['AbsAmount'].sum()
-                ax4.plot(hourly_spending.index, hourly_spending.values, marker='o', linewidth=2)
-                ax4.set_title('Hourly Spending Pattern')
-                ax4.set_xlabel('Hour of Day')
-                ax4.set_ylabel('Amount (₹)')
-                ax4.grid(True, alpha=0.3)
-            else:
-                ax4.text(0.5, 0.5, 'No Hourly Data', ha='center', va='center', transform=ax4.transAxes)
+        # 4. Hourly pattern
+        if has_debits:
+            hourly_spending = data['hourly']
+            ax4.plot(hourly_spending.index, hourly_spending.values, marker='o', linewidth=2)
+            ax4.set_title('Hourly Spending Pattern')
+            ax4.set_xlabel('Hour of Day')
+            ax4.set_ylabel('Amount (₹)')
+            ax4.grid(True, alpha=0.3)
+        else:
+            ax4.text(0.5, 0.5, 'No Hourly Data', ha='center', va='center', transform=ax4.transAxes)
         
         self.fig_detailed.suptitle('Detailed Time Trends Analysis', fontsize=16, fontweight='bold')
-        plt.tight_layout()
+        self.fig_detailed.tight_layout()
+    
+    @staticmethod
+    def amount_aggregates(df):
+        """Histogram counts, box plot statistics and cumulative spending
+        
+        Binning and quartiles are computed here once per filter view; the
+        chart only draws the precomputed shapes.
+        """
+        amounts = df['Amount']
+        debit_amounts = amounts[amounts < 0].abs()
+        credit_amounts = amounts[amounts > 0]
+        debit_data = df[df['Amount'] < 0]
+        
+        data = {
+            'amounts': np.histogram(amounts, bins=30),
+            'debit_amounts': np.histogram(debit_amounts, bins=20) if len(debit_amounts) > 0 else None,
+            'credit_amounts': np.histogram(credit_amounts, bins=20) if len(credit_amounts) > 0 else None,
+            'debits': len(debit_data),
+            'boxes': [],
+            'cumulative': None,
+        }
+        
+        if len(debit_data) > 0:
+            # Box plot by category (top 8 categories)
+            category_counts = debit_data['Category'].value_counts()
+            top_categories = category_counts[category_counts > 0].head(8).index
+            groups = debit_data.groupby('Category', observed=True)['AbsAmount']
+            category_amounts = [groups.get_group(cat).values for cat in top_categories]
+            category_labels = [cat[:15] + '...' if len(cat) > 15 else cat for cat in top_categories]
+            data['boxes'] = cbook.boxplot_stats(category_amounts, labels=category_labels)
+            
+            daily_spending = debit_data.groupby('Date')['AbsAmount'].sum().sort_index()
+            data['cumulative'] = daily_spending.cumsum()
+        
+        return data
     
     def create_amount_distribution_chart(self, df):
         """Create amount distribution analysis"""
@@ -1038,28 +1515,31 @@ class TransactionAnalyzer:
             ax.text(0.5, 0.5, 'No Data Available', ha='center', va='center')
             return
         
+        data = self.aggregate('amount', self.amount_aggregates, df)
+        
         # Create 2x2 subplot
         ax1 = self.fig_detailed.add_subplot(2, 2, 1)
         ax2 = self.fig_detailed.add_subplot(2, 2, 2)
         ax3 = self.fig_detailed.add_subplot(2, 2, 3)
         ax4 = self.fig_detailed.add_subplot(2, 2, 4)
         
+        # Histograms are drawn from cached (counts, edges) pairs
+        def hist(ax, binned, **kwargs):
+            counts, edges = binned
+            ax.hist(edges[:-1], bins=edges, weights=counts, **kwargs)
+        
         # 1. Amount histogram
-        amounts = df['Amount']
-        ax1.hist(amounts, bins=30, alpha=0.7, color='skyblue', edgecolor='black')
+        hist(ax1, data['amounts'], alpha=0.7, color='skyblue', edgecolor='black')
         ax1.set_title('Amount Distribution')
         ax1.set_xlabel('Amount (₹)')
         ax1.set_ylabel('Frequency')
         ax1.grid(True, alpha=0.3)
         
         # 2. Debit vs Credit amounts
-        debit_amounts = df[df['Amount'] < 0]['Amount'].abs()
-        credit_amounts = df[df['Amount'] > 0]['Amount']
-        
-        if len(debit_amounts) > 0:
-            ax2.hist(debit_amounts, bins=20, alpha=0.7, label='Debits', color='red')
-        if len(credit_amounts) > 0:
-            ax2.hist(credit_amounts, bins=20, alpha=0.7, label='Credits', color='green')
+        if data['debit_amounts'] is not None:
+            hist(ax2, data['debit_amounts'], alpha=0.7, label='Debits', color='red')
+        if data['credit_amounts'] is not None:
+            hist(ax2, data['credit_amounts'], alpha=0.7, label='Credits', color='green')
         
         ax2.set_title('Debit vs Credit Distribution')
         ax2.set_xlabel('Amount (₹)')
@@ -1068,20 +1548,9 @@ class TransactionAnalyzer:
         ax2.grid(True, alpha=0.3)
         
         # 3. Box plot by category (top 8 categories)
-        debit_data = df[df['Amount'] < 0]
-        if len(debit_data) > 0:
-            top_categories = debit_data['Category'].value_counts().head(8).index
-            category_amounts = []
-            category_labels = []
-            
-            for cat in top_categories:
-                cat_amounts = debit_data[debit_data['Category'] == cat]['AbsAmount']
-                if len(cat_amounts) > 0:
-                    category_amounts.append(cat_amounts.values)
-                    category_labels.append(cat[:15] + '...' if len(cat) > 15 else cat)
-            
-            if category_amounts:
-                ax3.boxplot(category_amounts, labels=category_labels)
+        if data['debits'] > 0:
+            if data['boxes']:
+                ax3.bxp(data['boxes'])
                 ax3.set_title('Amount Distribution by Category')
                 ax3.set_ylabel('Amount (₹)')
                 ax3.tick_params(axis='x', rotation=45)
@@ -1089,10 +1558,8 @@ class TransactionAnalyzer:
             ax3.text(0.5, 0.5, 'No Debit Data', ha='center', va='center', transform=ax3.transAxes)
         
         # 4. Cumulative spending over time
-        if len(debit_data) > 0:
-            daily_spending = debit_data.groupby('Date')['AbsAmount'].sum().sort_index()
-            cumulative_spending = daily_spending.cumsum()
-            
+        if data['cumulative'] is not None:
+            cumulative_spending = data['cumulative']
             ax4.plot(cumulative_spending.index, cumulative_spending.values, linewidth=2, color='red')
             ax4.set_title('Cumulative Spending Over Time')
             ax4.set_xlabel('Date')
@@ -1103,13 +1570,33 @@ class TransactionAnalyzer:
             ax4.text(0.5, 0.5, 'No Spending Data', ha='center', va='center', transform=ax4.transAxes)
         
         self.fig_detailed.suptitle('Amount Distribution Analysis', fontsize=16, fontweight='bold')
-        plt.tight_layout()
+        self.fig_detailed.tight_layout()
+    
+    @staticmethod
+    def merchant_aggregates(df):
+        """Top merchants by amount, frequency and average, plus their categories"""
+        debit_data = df[df['Amount'] < 0]
+        stats = debit_data.groupby('Transaction Details')['AbsAmount'].agg(['sum', 'mean'])
+        merchant_amounts = stats['sum'].sort_values(ascending=False).head(10)
+        
+        # Category counts of the top merchants, from a single grouped count
+        pair_counts = debit_data.groupby(['Transaction Details', 'Category'], observed=True).size()
+        merchant_categories = pair_counts.unstack(fill_value=0).reindex(merchant_amounts.index)
+        merchant_categories = merchant_categories.loc[:, (merchant_categories > 0).any()]
+        
+        return {
+            'debits': len(debit_data),
+            'amounts': merchant_amounts,
+            'counts': debit_data['Transaction Details'].value_counts().head(10),
+            'averages': stats['mean'].sort_values(ascending=False).head(10),
+            'categories': merchant_categories,
+        }
     
     def create_merchant_analysis_chart(self, df):
         """Create merchant analysis"""
-        debit_data = df[df['Amount'] < 0]
+        data = self.aggregate('merchant', self.merchant_aggregates, df)
         
-        if len(debit_data) == 0:
+        if data['debits'] == 0:
             ax = self.fig_detailed.add_subplot(111)
             ax.text(0.5, 0.5, 'No Spending Data Available', ha='center', va='center')
             return
@@ -1121,7 +1608,7 @@ class TransactionAnalyzer:
         ax4 = self.fig_detailed.add_subplot(2, 2, 4)
         
         # 1. Top merchants by amount
-        merchant_amounts = debit_data.groupby('Transaction Details')['AbsAmount'].sum().sort_values(ascending=False).head(10)
+        merchant_amounts = data['amounts']
         ax1.barh(range(len(merchant_amounts)), merchant_amounts.values,
                 color=plt.cm.Set1(np.linspace(0, 1, len(merchant_amounts))))
         ax1.set_yticks(range(len(merchant_amounts)))
@@ -1131,7 +1618,7 @@ class TransactionAnalyzer:
         ax1.set_xlabel('Amount (₹)')
         
         # 2. Top merchants by frequency
-        merchant_counts = debit_data['Transaction Details'].value_counts().head(10)
+        merchant_counts = data['counts']
         ax2.bar(range(len(merchant_counts)), merchant_counts.values,
                color=plt.cm.Set2(np.linspace(0, 1, len(merchant_counts))))
         ax2.set_xticks(range(len(merchant_counts)))
@@ -1141,7 +1628,7 @@ class TransactionAnalyzer:
         ax2.set_ylabel('Transaction Count')
         
         # 3. Average amount by merchant
-        merchant_avg = debit_data.groupby('Transaction Details')['AbsAmount'].mean().sort_values(ascending=False).head(10)
+        merchant_avg = data['averages']
         ax3.bar(range(len(merchant_avg)), merchant_avg.values,
                color=plt.cm.Set3(np.linspace(0, 1, len(merchant_avg))))
         ax3.set_xticks(range(len(merchant_avg)))
@@ -1151,32 +1638,20 @@ class TransactionAnalyzer:
         ax3.set_ylabel('Average Amount (₹)')
         
         # 4. Merchant category distribution
-        merchant_categories = debit_data.groupby(['Transaction Details', 'Category']).size().reset_index(name='count')
-        top_merchants = merchant_amounts.head(15).index
-        
-        # Create a stacked bar for top merchants showing their categories
-        merchant_cat_data = {}
-        for merchant in top_merchants:
-            merchant_data = debit_data[debit_data['Transaction Details'] == merchant]
-            cat_counts = merchant_data['Category'].value_counts()
-            merchant_cat_data[merchant] = cat_counts
-        
-        if merchant_cat_data:
-            # Get all unique categories
-            all_cats = set()
-            for cats in merchant_cat_data.values():
-                all_cats.update(cats.index)
-            all_cats = sorted(list(all_cats))
+        merchant_categories = data['categories']
+        
+        if len(merchant_categories) > 0:
+            all_cats = sorted(merchant_categories.columns)
             
-            # Create matrix for stacked bar
-            merchants = list(merchant_cat_data.keys())[:8]  # Limit to 8 for readability
+            # Create a stacked bar for top merchants showing their categories
+            merchants = list(merchant_categories.index)[:8]  # Limit to 8 for readability
             bottom = np.zeros(len(merchants))
             
             colors = plt.cm.tab20(np.linspace(0, 1, len(all_cats)))
             
             for i, cat in enumerate(all_cats):
-                values = [merchant_cat_data[merchant].get(cat, 0) for merchant in merchants]
-                if sum(values) > 0:  # Only plot if there are values
+                values = merchant_categories.loc[merchants, cat].values
+                if values.sum() > 0:  # Only plot if there are values
                     ax4.bar(range(len(merchants)), values, bottom=bottom, label=cat[:10], color=colors[i])
                     bottom += values
             
@@ -1187,15 +1662,22 @@ class TransactionAnalyzer:
             ax4.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
         
         self.fig_detailed.suptitle('Merchant Analysis', fontsize=16, fontweight='bold')
-        plt.tight_layout()
+        self.fig_detailed.tight_layout()
     
     def update_data_table(self):
-        """Update the transaction data table"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """Update the transaction data table
         
+        The sort order is computed once per filtered_df and sort column;
+        refreshing with the same data only changes the row limit and
+        redraws the visible rows.
+        """
         if self.filtered_df is None or len(self.filtered_df) == 0:
+            self.table_source = None
+            self.table_order = None
+            self.table_data = None
+            self.table_rows = 0
+            self.table_offset = 0
+            self.render_data_table()
             return
         
         # Get display settings
@@ -1206,70 +1688,269 @@ class TransactionAnalyzer:
         
         sort_by = self.sort_by_var.get()
         
-        # Sort data
-        display_df = self.filtered_df.copy()
-        
+        # Sort once per filter change (the frame is held, so identity is safe)
+        if self.table_source is not self.filtered_df or self.table_sort_by != sort_by:
+            self.table_order = self.sorted_positions(self.filtered_df, sort_by)
+            self.table_source = self.filtered_df
+            self.table_sort_by = sort_by
+            self.table_data = {
+                col: self.filtered_df[col].to_numpy()
+                for col in ('DateTime', 'Transaction Details', 'Category', 'Amount', 'Type')
+            }
+            self.table_offset = 0
+        
+        self.table_rows = min(show_count, len(self.table_order))
+        self.render_data_table()
+    
+    @staticmethod
+    def sorted_positions(df, sort_by):
+        """Row positions of df sorted descending by a column, ties in original order"""
         try:
-            if sort_by in display_df.columns:
-                display_df = display_df.sort_values(sort_by, ascending=False)
-        except:
-            display_df = display_df.sort_values('DateTime', ascending=False)
-        
-        # Limit rows
-        display_df = display_df.head(show_count)
+            if sort_by in df.columns:
+                column = df[sort_by].reset_index(drop=True)
+                return column.sort_values(ascending=False, kind='stable').index.to_numpy()
+        except Exception:
+            column = df['DateTime'].reset_index(drop=True)
+            return column.sort_values(ascending=False, kind='stable').index.to_numpy()
+        return np.arange(len(df))
+    
+    def format_table_row(self, position):
+        """Treeview values and tags for one filtered_df row"""
+        data = self.table_data
+        date_value = data['DateTime'][position]
+        date_str = pd.Timestamp(date_value).strftime('%Y-%m-%d %H:%M') if pd.notna(date_value) else 'N/A'
+        details = str(data['Transaction Details'][position])
+        details = details[:50] + "..." if len(details) > 50 else details
+        category = data['Category'][position] if pd.notna(data['Category'][position]) else 'N/A'
+        amount = data['Amount'][position]
+        trans_type = data['Type'][position] if pd.notna(data['Type'][position]) else 'N/A'
+        
+        # Color coding
+        tags = ('credit',) if amount > 0 else ('debit',)
+        return (date_str, details, category, f"₹{amount:,.2f}", trans_type), tags
+    
+    def render_data_table(self):
+        """Fill the Treeview with the rows currently scrolled into view"""
+        visible = self.table_visible_rows
+        self.table_offset = max(0, min(self.table_offset, self.table_rows - visible))
         
-        # Insert data into treeview
-        for _, row in display_df.iterrows():
+        if self.table_order is not None:
+            window = self.table_order[self.table_offset:min(self.table_offset + visible, self.table_rows)]
+        else:
+            window = []
+        
+        # Reuse the existing items; only the difference is inserted or deleted
+        items = list(self.tree.get_children())
+        if len(items) > len(window):
+            self.tree.delete(*items[len(window):])
+            items = items[:len(window)]
+        while len(items) < len(window):
+            items.append(self.tree.insert('', 'end'))
+        
+        self.tree.selection_remove(self.tree.selection())
+        for item, position in zip(items, window):
             try:
-                date_str = row['DateTime'].strftime('%Y-%m-%d %H:%M') if pd.notna(row['DateTime']) else 'N/A'
-                details = str(row['Transaction Details'])[:50] + "..." if len(str(row['Transaction Details'])) > 50 else str(row['Transaction Details'])
-                category = row['Category'] if pd.notna(row['Category']) else 'N/A'
-                amount = f"₹{row['Amount']:,.2f}"
-                trans_type = row['Type'] if pd.notna(row['Type']) else 'N/A'
-                
-                # Color coding
-                tags = ('credit',) if row['Amount'] > 0 else ('debit',)
-                
-                self.tree.insert('', 'end', values=(date_str, details, category, amount, trans_type), tags=tags)
-            except Exception as e:
-                continue  # Skip problematic rows
-        
-        # Configure tag colors
-        self.tree.tag_configure('credit', foreground='green')
-        self.tree.tag_configure('debit', foreground='red')
+                values, tags = self.format_table_row(position)
+            except Exception:
+                values, tags = ('N/A', '', '', '', ''), ()  # Problematic row
+            self.tree.item(item, values=values, tags=tags)
+        
+        if self.table_rows > 0:
+            self.table_scroll.set(self.table_offset / self.table_rows,
+                                  (self.table_offset + len(window)) / self.table_rows)
+        else:
+            self.table_scroll.set(0, 1)
+    
+    def scroll_data_table(self, action, amount=None, unit=None):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if action == 'moveto':
+            self.table_offset = int(float(amount) * self.table_rows)
+        elif action == 'scroll':
+            step = self.table_visible_rows if unit == 'pages' else 1
+            self.table_offset += int(amount) * step
+        self.render_data_table()
+    
+    def on_table_wheel(self, event):
+        """Scroll the virtual rows with the mouse wheel"""
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.scroll_data_table('scroll', -3, 'units')
+        else:
+            self.scroll_data_table('scroll', 3, 'units')
+        return 'break'
+    
+    def on_table_resize(self, event):
+        """Show as many rows as fit the new table height"""
+        style = ttk.Style()
+        row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+        # Leave room for the heading row
+        visible = max(1, (event.height - row_height - 4) // row_height)
+        if visible != self.table_visible_rows:
+            self.table_visible_rows = visible
+            self.render_data_table()
     
     def export_csv(self):
-        """Export filtered data to CSV"""
+        """Export filtered data to CSV, compressed CSV or Parquet
+        
+        The file is written in chunks on a worker thread. It reads the
+        shared filtered frame directly, since frames are never modified in
+        place, so no export copy is made.
+        """
         if self.filtered_df is None or len(self.filtered_df) == 0:
             messagebox.showwarning("Warning", "No data to export!")
             return
         
+        if self.loader is not None or self.exporter is not None:
+            self.update_status("Another file operation is running - cancel it first")
+            return
+        
+        filetypes = [("CSV files", "*.csv"), ("Gzip compressed CSV", "*.csv.gz")]
+        if HAS_ZSTD:
+            filetypes.append(("Zstandard compressed CSV", "*.csv.zst"))
+        if HAS_PYARROW:
+            filetypes.append(("Parquet files", "*.parquet"))
+        filetypes.append(("All files", "*.*"))
+        
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=filetypes,
+            title="Export Transactions"
+        )
+        
+        if not filename:
+            return
+        
+        # Select relevant columns (those shown in the data table) unless
+        # every column was asked for
+        df = self.filtered_df
+        if self.export_all_columns_var.get():
+            export_columns = list(df.columns)
+        else:
+            export_columns = [col for col in EXPORT_COLUMNS if col in df.columns]
+        
+        self.export_cancel = threading.Event()
+        self.export_queue = queue.Queue()
+        self.exporter = threading.Thread(
+            target=self.export_worker,
+            args=(df, export_columns, filename, self.export_cancel, self.export_queue),
+            daemon=True
+        )
+        
+        self.update_status("Exporting...")
+        self.progress.config(mode='determinate', maximum=100, value=0)
+        self.cancel_button.pack(side='right', padx=(10, 0))
+        
+        self.exporter.start()
+        self.root.after(LOAD_POLL_MS, self.poll_exporter)
+    
+    def export_worker(self, df, columns, filename, cancel, messages):
+        """Write df[columns] to filename in chunks, off the Tk thread
+        
+        Posts ('progress', rows written, fraction) after every chunk, then
+        exactly one of 'done', 'cancelled' or 'error'. A partial file is
+        removed if the export does not complete.
+        """
+        def report(rows):
+            if cancel.is_set():
+                raise LoadCancelled()
+            messages.put(('progress', rows, rows / max(len(df), 1)))
+        
         try:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                title="Export Transactions to CSV"
-            )
-            
-            if filename:
-                # Prepare export data
-                export_df = self.filtered_df.copy()
-                
-                # Format DateTime for export
-                if 'DateTime' in export_df.columns:
-                    export_df['DateTime'] = export_df['DateTime'].dt.strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Select relevant columns
-                export_columns = ['DateTime', 'Transaction Details', 'Category', 'Amount', 'Type']
-                export_columns = [col for col in export_columns if col in export_df.columns]
-                
-                export_df[export_columns].to_csv(filename, index=False)
-                
-                messagebox.showinfo("Export Successful", f"Data exported to {filename}\n{len(export_df)} transactions exported.")
-                self.update_status(f"Exported {len(export_df)} transactions to CSV")
+            if filename.lower().endswith('.parquet'):
+                self.write_parquet_chunks(df, columns, filename, report)
+            else:
+                self.write_csv_chunks(df, columns, filename, report)
+            messages.put(('done', len(df), filename))
+        
+        except LoadCancelled:
+            self.remove_partial(filename)
+            messages.put(('cancelled', None, filename))
         
         except Exception as e:
-            messagebox.showerror("Export Error", f"Failed to export data:\n{str(e)}")
+            self.remove_partial(filename)
+            messages.put(('error', str(e), filename))
+    
+    @staticmethod
+    def open_export(filename):
+        """Text handle for a CSV export, compressed according to the extension"""
+        name = filename.lower()
+        if name.endswith('.gz'):
+            return gzip.open(filename, 'wt', encoding='utf-8', newline='')
+        if name.endswith('.zst'):
+            if not HAS_ZSTD:
+                raise RuntimeError("Zstandard export needs the zstandard package")
+            return zstandard.open(filename, 'wt', encoding='utf-8', newline='')
+        return open(filename, 'w', encoding='utf-8', newline='')
+    
+    def write_csv_chunks(self, df, columns, filename, report):
+        """Write CSV one slice of rows at a time"""
+        with self.open_export(filename) as handle:
+            for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+                chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS][columns]
+                # Format DateTime for export
+                chunk.to_csv(handle, header=(start == 0), index=False,
+                             date_format='%Y-%m-%d %H:%M:%S')
+                report(start + len(chunk))
+    
+    @staticmethod
+    def write_parquet_chunks(df, columns, filename, report):
+        """Write Parquet with one row group per slice of rows"""
+        if not HAS_PYARROW:
+            raise RuntimeError("Parquet export needs the pyarrow package")
+        
+        # Columns that are empty in the first slice get their type from the
+        # first value further down, so later row groups fit the schema
+        schema = pa.Schema.from_pandas(df.iloc[:EXPORT_CHUNK_ROWS][columns], preserve_index=False)
+        for i, field in enumerate(schema):
+            if pa.types.is_null(field.type):
+                values = df[field.name].dropna()
+                if len(values) > 0:
+                    schema = schema.set(i, field.with_type(pa.array(values.head(1)).type))
+        
+        with pq.ParquetWriter(filename, schema) as writer:
+            for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+                chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS][columns]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                report(start + len(chunk))
+    
+    @staticmethod
+    def remove_partial(filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+    
+    def poll_exporter(self):
+        """Apply queued exporter messages on the Tk thread until the export ends"""
+        try:
+            while True:
+                kind, value, extra = self.export_queue.get_nowait()
+                if kind == 'progress':
+                    self.progress.config(value=extra * 100)
+                    self.update_status(f"Exporting... {value:,} rows written")
+                else:
+                    self.finish_export(kind, value, extra)
+                    return
+        except queue.Empty:
+            pass
+        
+        self.root.after(LOAD_POLL_MS, self.poll_exporter)
+    
+    def finish_export(self, kind, value, filename):
+        """Report how an export ended"""
+        self.exporter = None
+        self.progress.config(value=0)
+        self.cancel_button.pack_forget()
+        
+        if kind == 'done':
+            messagebox.showinfo("Export Successful", f"Data exported to {filename}\n{value} transactions exported.")
+            self.update_status(f"Exported {value} transactions to {os.path.basename(filename)}")
+        
+        elif kind == 'cancelled':
+            self.update_status("Export cancelled")
+        
+        else:
+            self.update_status("Error exporting data")
+            messagebox.showerror("Export Error", f"Failed to export data:\n{value}")
     
     def generate_report(self):
         """Generate comprehensive analysis report"""
@@ -1288,10 +1969,12 @@ class TransactionAnalyzer:
                 self.update_status("Generating report...")
                 self.progress.start(10)
                 
-                report = self.create_analysis_report()
-                
+                # Sections are written as soon as they are produced
+                summary_only = self.report_summary_var.get()
                 with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(report)
+                    for section in self.report_sections(self.filtered_df, summary_only):
+                        f.write(section)
+                        self.root.update_idletasks()
                 
                 messagebox.showinfo("Report Generated", f"Analysis report saved to {filename}")
                 self.update_status("Report generated successfully")
@@ -1302,19 +1985,34 @@ class TransactionAnalyzer:
         finally:
             self.progress.stop()
     
-    def create_analysis_report(self):
+    def create_analysis_report(self, summary_only=False):
         """Create comprehensive analysis report"""
-        df = self.filtered_df
-        
+        return ''.join(self.report_sections(self.filtered_df, summary_only))
+    
+    def report_sections(self, df, summary_only=False):
+        """Yield the analysis report for df one section at a time
+        
+        Aggregates come from masked columns instead of copied debit and
+        credit frames, and each grouping is computed once for every section
+        that needs it. summary_only stops after the financial summary,
+        skipping all per-group breakdowns.
+        """
         # Calculate statistics
-        debit_data = df[df['Amount'] < 0]
-        credit_data = df[df['Amount'] > 0]
-        
-        total_spent = debit_data['Amount'].abs().sum() if len(debit_data) > 0 else 0
-        total_received = credit_data['Amount'].sum() if len(credit_data) > 0 else 0
+        amounts = df['Amount']
+        debit_mask = amounts < 0
+        credit_mask = amounts > 0
+        spent = amounts[debit_mask].abs()
+        received = amounts[credit_mask]
+        has_debits = len(spent) > 0
+        
+        total_spent = spent.sum() if has_debits else 0
+        total_received = received.sum() if len(received) > 0 else 0
         net_amount = total_received - total_spent
         
-        report = f"""
+        first_date = df['DateTime'].min()
+        last_date = df['DateTime'].max()
+        
+        yield f"""
 COMPREHENSIVE TRANSACTION ANALYSIS REPORT
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 {'='*60}
@@ -1322,88 +2020,109 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 OVERVIEW
 {'='*60}
 Total Transactions Analyzed: {len(df):,}
-Date Range: {df['DateTime'].min().strftime('%Y-%m-%d')} to {df['DateTime'].max().strftime('%Y-%m-%d')}
-Analysis Period: {(df['DateTime'].max() - df['DateTime'].min()).days} days
+Date Range: {first_date.strftime('%Y-%m-%d')} to {last_date.strftime('%Y-%m-%d')}
+Analysis Period: {(last_date - first_date).days} days
 
 FINANCIAL SUMMARY
 {'='*60}
 Total Money Spent: ₹{total_spent:,.2f}
 Total Money Received: ₹{total_received:,.2f}
 Net Cash Flow: ₹{net_amount:,.2f}
-Average Transaction Amount: ₹{df['Amount'].mean():,.2f}
-Median Transaction Amount: ₹{df['Amount'].median():,.2f}
-
-Largest Single Expense: ₹{debit_data['Amount'].abs().max():,.2f} if len(debit_data) > 0 else 0
-Largest Single Income: ₹{credit_data['Amount'].max():,.2f} if len(credit_data) > 0 else 0
+Average Transaction Amount: ₹{amounts.mean():,.2f}
+Median Transaction Amount: ₹{amounts.median():,.2f}
 
+Largest Single Expense: ₹{spent.max() if has_debits else 0:,.2f}
+Largest Single Income: ₹{received.max() if len(received) > 0 else 0:,.2f}
+"""
+        
+        if not summary_only:
+            yield from self.report_breakdowns(df, debit_mask, credit_mask, total_spent)
+        
+        yield f"\nREPORT END\n"
+        yield f"Generated by Bank Transaction Analyzer v1.0\n"
+    
+    def report_breakdowns(self, df, debit_mask, credit_mask, total_spent):
+        """Per-category, merchant, month and weekday sections of the report"""
+        amounts = df['Amount']
+        debit_amounts = df['AbsAmount'][debit_mask]
+        has_debits = len(debit_amounts) > 0
+        
+        # Totals and counts per category feed three sections below
+        if has_debits:
+            category_stats = debit_amounts.groupby(
+                df['Category'][debit_mask], observed=True
+            ).agg(['sum', 'size'])
+        
+        yield f"""
 SPENDING ANALYSIS
 {'='*60}
 """
         
         # Top spending categories
-        if len(debit_data) > 0:
-            top_categories = debit_data.groupby('Category')['AbsAmount'].sum().sort_values(ascending=False).head(10)
-            report += "Top Spending Categories:\n"
+        if has_debits:
+            top_categories = category_stats['sum'].sort_values(ascending=False).head(10)
+            section = "Top Spending Categories:\n"
             for i, (category, amount) in enumerate(top_categories.items(), 1):
                 percentage = (amount / total_spent) * 100
-                report += f"{i:2d}. {category:<30} ₹{amount:>10,.2f} ({percentage:5.1f}%)\n"
+                section += f"{i:2d}. {category:<30} ₹{amount:>10,.2f} ({percentage:5.1f}%)\n"
             
-            report += f"\n"
+            yield section + "\n"
         
         # Top merchants
-        if len(debit_data) > 0:
-            top_merchants = debit_data.groupby('Transaction Details')['AbsAmount'].sum().sort_values(ascending=False).head(10)
-            report += "Top Merchants by Spending:\n"
+        if has_debits:
+            merchant_totals = debit_amounts.groupby(df['Transaction Details'][debit_mask]).sum()
+            top_merchants = merchant_totals.sort_values(ascending=False).head(10)
+            section = "Top Merchants by Spending:\n"
             for i, (merchant, amount) in enumerate(top_merchants.items(), 1):
-                report += f"{i:2d}. {merchant:<40} ₹{amount:>10,.2f}\n"
+                section += f"{i:2d}. {merchant:<40} ₹{amount:>10,.2f}\n"
             
-            report += f"\n"
+            yield section + "\n"
         
         # Monthly breakdown
         if len(df) > 0:
-            monthly_summary = df.groupby('Month').agg({
-                'Amount': ['count', lambda x: abs(x[x < 0].sum()), lambda x: x[x > 0].sum()]
-            })
-            monthly_summary.columns = ['Count', 'Spent', 'Received']
+            monthly_summary = pd.DataFrame({
+                'Count': amounts,
+                'Spent': amounts.where(debit_mask, 0),
+                'Received': amounts.where(credit_mask, 0),
+            }).groupby(df['Month']).agg({'Count': 'count', 'Spent': 'sum', 'Received': 'sum'})
             
-            report += "Monthly Breakdown:\n"
-            report += f"{'Month':<10} {'Transactions':<12} {'Spent':<15} {'Received':<15} {'Net':<15}\n"
-            report += f"{'-'*67}\n"
+            section = "Monthly Breakdown:\n"
+            section += f"{'Month':<10} {'Transactions':<12} {'Spent':<15} {'Received':<15} {'Net':<15}\n"
+            section += f"{'-'*67}\n"
             
-            for month in monthly_summary.index:
-                count = int(monthly_summary.loc[month, 'Count'])
-                spent = monthly_summary.loc[month, 'Spent']
-                received = monthly_summary.loc[month, 'Received']
+            for month, count, spent, received in monthly_summary.itertuples():
+                spent = abs(spent)
                 net = received - spent
                 
-                report += f"{month:<10} {count:<12} ₹{spent:<14,.0f} ₹{received:<14,.0f} ₹{net:<14,.0f}\n"
+                section += f"{month:<10} {int(count):<12} ₹{spent:<14,.0f} ₹{received:<14,.0f} ₹{net:<14,.0f}\n"
             
-            report += f"\n"
+            yield section + "\n"
         
         # Day of week analysis
-        if len(debit_data) > 0:
-            dow_spending = debit_data.groupby('DayOfWeek')['AbsAmount'].sum().sort_values(ascending=False)
-            report += "Spending by Day of Week:\n"
+        if has_debits:
+            dow_spending = debit_amounts.groupby(df['DayOfWeek'][debit_mask]).sum().sort_values(ascending=False)
+            section = "Spending by Day of Week:\n"
             for day, amount in dow_spending.items():
-                report += f"{day:<10} ₹{amount:>10,.2f}\n"
+                section += f"{day:<10} ₹{amount:>10,.2f}\n"
             
-            report += f"\n"
+            yield section + "\n"
         
         # Transaction frequency analysis
-        report += "TRANSACTION PATTERNS\n"
-        report += "=" * 60 + "\n"
+        days = max((df['DateTime'].max() - df['DateTime'].min()).days, 1)
+        busiest_day = df['DayOfWeek'].mode()
         
-        report += f"Average transactions per day: {len(df) / max((df['DateTime'].max() - df['DateTime'].min()).days, 1):.1f}\n"
-        report += f"Most active day: {df['DayOfWeek'].mode().iloc[0] if len(df['DayOfWeek'].mode()) > 0 else 'N/A'}\n"
+        section = "TRANSACTION PATTERNS\n"
+        section += "=" * 60 + "\n"
         
-        if len(debit_data) > 0:
-            report += f"Most expensive category: {debit_data.groupby('Category')['AbsAmount'].sum().idxmax()}\n"
-            report += f"Most frequent spending category: {debit_data['Category'].mode().iloc[0] if len(debit_data['Category'].mode()) > 0 else 'N/A'}\n"
+        section += f"Average transactions per day: {len(df) / days:.1f}\n"
+        section += f"Most active day: {busiest_day.iloc[0] if len(busiest_day) > 0 else 'N/A'}\n"
         
-        report += f"\nREPORT END\n"
-        report += f"Generated by Bank Transaction Analyzer v1.0\n"
+        if has_debits:
+            # idxmax takes the first label among ties, as mode() does
+            section += f"Most expensive category: {category_stats['sum'].idxmax()}\n"
+            section += f"Most frequent spending category: {category_stats['size'].idxmax()}\n"
         
-        return report
+        yield section
     
     def save_categories(self):
         """Save categories from text widget"""
@@ -1428,8 +2147,10 @@ SPENDING ANALYSIS
                 
                 # Re-categorize existing data if available
                 if self.df is not None:
-                    self.df['Category'] = self.df['Transaction Details'].apply(self.categorize_transaction)
-                    self.filtered_df = self.df.copy()
+                    self.df = self.df.assign(Category=self.categorize_series(self.df['Transaction Details']))
+                    self.original_df = self.filtered_df = self.df
+                    self.filter_key = None
+                    self.data_changed()
                     self.update_all_displays()
             else:
                 messagebox.showwarning("Warning", "No valid categories found!")
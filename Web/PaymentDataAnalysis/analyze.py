@@ -1,14 +1,53 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, g
 from flask_cors import CORS
 import pandas as pd
+from pandas.io.parsers import TextParser
 import numpy as np
 import json
+import gzip
 from datetime import datetime, timedelta
 import os
+import hashlib
+import threading
+import time
+import uuid
+import shutil
+import multiprocessing
+import cProfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from werkzeug.utils import secure_filename
+import openpyxl
 import re
 import logging
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+# Column detection, date parsing and categorization shared with Python/payment/Payments.py
+from statement_normalization import (
+    MISC_CATEGORY, DATE_FORMATS, TIME_FORMATS, KeywordCategorizer, DateParser,
+    detect_columns, parse_datetimes, date_report, clean_amounts
+)
+
+# orjson is used for response bodies when available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# brotli is offered to clients that accept it, gzip otherwise
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Feather snapshots of the processed data need pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,6 +57,62 @@ app = Flask(__name__)
 CORS(app)
 app.config['UPLOAD_FOLDER'] = '.'
 app.config['MAX_CONTENT_LENGTH'] = 32 * 1024 * 1024  # 32MB max file size
+# File behind /analyze; /upload switches it to the last uploaded file
+app.config['DATA_FILE'] = 'data.xlsx'
+# Names the uploaded file behind /analyze so a restart picks it up again
+app.config['DATA_MARKER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'data.active')
+
+# Uploaded datasets other than the default one live in <UPLOAD_FOLDER>/datasets/<id>.<ext>
+app.config['DATASET_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'datasets')
+# Processed data kept in memory across all datasets before the least recently used are dropped
+app.config['ANALYZER_MEMORY_BUDGET'] = 1024 * 1024 * 1024
+
+# Store processed data with categoricals and datetime64 dates (see compact_frame)
+app.config['COMPACT_STORAGE'] = True
+
+# Background analysis jobs: worker threads and how many jobs may be queued or running
+app.config['ANALYSIS_WORKERS'] = 2
+app.config['MAX_PENDING_JOBS'] = 4
+# Worker processes for datasets made of several statement files
+app.config['LOAD_WORKERS'] = os.cpu_count() or 1
+# Requests sent with an X-Profile header are run under cProfile and the
+# stats written to PROFILE_FOLDER; off by default since anyone could ask
+app.config['PROFILE_REQUESTS'] = False
+app.config['PROFILE_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'profiles')
+
+# Derived and details columns always stored as categoricals in compact mode
+COMPACT_CATEGORY_COLUMNS = ['Transaction Details', 'Category', 'Type', 'Month', 'Week', 'DayOfWeek']
+# Other text columns become categoricals when at most this share of values is distinct
+COMPACT_CATEGORY_RATIO = 0.5
+
+DEFAULT_DATASET = 'default'
+DATASET_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+DATA_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+
+# Rows read, normalized and appended per step when streaming a file in
+INGEST_CHUNK_SIZE = 50000
+# Rows with the same DateTime, Amount and details in several statement files are kept once
+DEDUPE_COLUMNS = ['DateTime', 'Amount', 'Transaction Details']
+# Processed data is cached next to the upload as <file>.snapshot.feather
+SNAPSHOT_SUFFIX = '.snapshot.feather'
+# Schema metadata key of a snapshot: JSON with its fingerprint and the load report
+SNAPSHOT_METADATA_KEY = b'analyzer'
+# Part of the snapshot fingerprint; bump whenever parsing, categorizing or the
+# derived columns change, so snapshots of older code are reprocessed
+PROCESSING_VERSION = 1
+
+# Transaction rows sent to the frontend and how they are formatted
+RECORD_COLUMNS = ['DateTime', 'Transaction Details', 'Category', 'Amount', 'Type']
+RECORD_LIMIT = 100
+# Largest transactions kept per category and per merchant by FilterIndex
+TOP_K = 100
+TRANSACTION_PAGE_SIZE = 1000
+MAX_TRANSACTION_PAGE_SIZE = 10000
+# Recent /filter results kept encoded per dataset
+FILTER_CACHE_SIZE = 32
+# JSON bodies smaller than this are sent uncompressed
+COMPRESS_MIN_SIZE = 1024
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
 
 # Enhanced Category detection keywords
 CATEGORY_KEYWORDS = {
@@ -72,12 +167,966 @@ CATEGORY_KEYWORDS = {
     ]
 }
 
-class TransactionAnalyzer:
+
+class Metrics:
+    """Counters, gauges and duration histograms in Prometheus text format.
+
+    Series are keyed by metric name and a sorted tuple of label pairs.
+    Gauges that describe current state are filled by collectors, callables
+    run on every render.
+    """
+
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
     def __init__(self):
+        self.counters = defaultdict(float)
+        self.histograms = {}
+        self.help = {}
+        self.collectors = []
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((labels or {}).items()))
+
+    def describe(self, name, kind, text):
+        self.help[name] = (kind, text)
+
+    def increment(self, name, labels=None, value=1):
+        with self.lock:
+            self.counters[self._key(name, labels)] += value
+
+    def observe(self, name, seconds, labels=None):
+        key = self._key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * len(self.BUCKETS), 0, 0.0]
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += 1
+            histogram[2] += seconds
+
+    @contextmanager
+    def timer(self, stage):
+        """Record the duration of a block under analyzer_stage_seconds{stage=...}"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('analyzer_stage_seconds', time.perf_counter() - start, {"stage": stage})
+
+    def timed_iter(self, stage, iterable):
+        """Yield from iterable, timing each step as a stage"""
+        iterator = iter(iterable)
+        while True:
+            with self.timer(stage):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    @staticmethod
+    def _series(name, labels, value):
+        if labels:
+            escaped = ','.join(
+                '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                for k, v in labels
+            )
+            return f"{name}{{{escaped}}} {value}"
+        return f"{name} {value}"
+
+    def render(self):
+        """All series in the Prometheus text exposition format"""
+        gauges = []
+        for collect in self.collectors:
+            try:
+                gauges.extend(collect())
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted((key, (list(h[0]), h[1], h[2])) for key, h in self.histograms.items())
+
+        lines = []
+        described = set()
+
+        def header(name, default_kind):
+            if name not in described:
+                described.add(name)
+                kind, text = self.help.get(name, (default_kind, name))
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name, 'counter')
+            lines.append(self._series(name, labels, value))
+        for name, labels, value in sorted(gauges, key=lambda gauge: gauge[0]):
+            header(name, 'gauge')
+            lines.append(self._series(name, tuple(sorted(labels.items())), value))
+        for (name, labels), (buckets, count, total) in histograms:
+            header(name, 'histogram')
+            for bound, bucket_count in zip(self.BUCKETS, buckets):
+                lines.append(self._series(name + '_bucket', labels + (('le', bound),), bucket_count))
+            lines.append(self._series(name + '_bucket', labels + (('le', '+Inf'),), count))
+            lines.append(self._series(name + '_count', labels, count))
+            lines.append(self._series(name + '_sum', labels, total))
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+metrics.describe('analyzer_stage_seconds', 'histogram', 'Time spent in each loading, analysis and encoding stage')
+metrics.describe('analyzer_rows_processed_total', 'counter', 'Rows normalized from source files')
+metrics.describe('analyzer_datetime_failures_total', 'counter', 'Date and time values that could not be parsed')
+metrics.describe('analyzer_cache_requests_total', 'counter', 'Analysis and filter cache lookups by result')
+metrics.describe('http_requests_total', 'counter', 'Requests by endpoint, method and status')
+metrics.describe('http_request_duration_seconds', 'histogram', 'Request handling time by endpoint')
+metrics.describe('analyzer_datasets_loaded', 'gauge', 'Datasets held in memory')
+metrics.describe('analyzer_memory_budget_bytes', 'gauge', 'Memory budget for processed data of all datasets')
+metrics.describe('analyzer_jobs_pending', 'gauge', 'Upload jobs queued or running')
+metrics.describe('analyzer_dataset_rows', 'gauge', 'Processed rows per loaded dataset')
+metrics.describe('analyzer_dataset_memory_bytes', 'gauge', 'Processed data size per loaded dataset')
+
+
+def _json_default(value):
+    """Fallback conversion for numpy and pandas values"""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(payload):
+    """Encode a payload as JSON bytes, with orjson when it is installed"""
+    with metrics.timer('encode'):
+        if HAS_ORJSON:
+            return orjson.dumps(payload, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(payload, default=_json_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def json_response(payload, status=200, etag=None):
+    """Flask response with a JSON body, pre-encoded bytes or a payload to encode.
+
+    With an etag the client is told to revalidate instead of refetching.
+    """
+    body = payload if isinstance(payload, bytes) else dumps(payload)
+    response = Response(body, status=status, mimetype='application/json')
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def request_etag(version, *parts):
+    """ETag value for a dataset version plus request parameters, or None without a version"""
+    if version is None:
+        return None
+    key = json.dumps([version, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+def not_modified(etag):
+    """304 response when the request already holds etag, else None"""
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        # Weak, since the body is the same JSON under any Content-Encoding
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return None
+
+
+def format_record_columns(df):
+    """Format RECORD_COLUMNS of a frame column by column.
+
+    Dates go through one dt.strftime call, numbers are converted in bulk and
+    missing values become None. Returns the column names and one list of
+    JSON-ready values per column.
+    """
+    columns = [col for col in RECORD_COLUMNS if col in df.columns]
+    values = []
+    for col in columns:
+        series = df[col]
+        missing = series.isna().to_numpy()
+        if col == 'DateTime' and pd.api.types.is_datetime64_any_dtype(series):
+            formatted = series.dt.strftime(DATETIME_FORMAT).to_numpy(dtype=object)
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            formatted = series.to_numpy(dtype='float64').astype(object)
+        else:
+            formatted = series.astype(str).to_numpy(dtype=object)
+        if missing.any():
+            formatted[missing] = None
+        values.append(formatted.tolist())
+    return columns, values
+
+
+def format_records(df):
+    """JSON-ready list of transaction dicts for a frame"""
+    with metrics.timer('format_records'):
+        columns, values = format_record_columns(df)
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def compact_frame(df):
+    """Shrink a processed frame in place and return it.
+
+    Repeated strings (details, derived labels and low-cardinality text
+    columns) become categoricals, so each distinct string is stored once,
+    and Date becomes datetime64 instead of Python date objects. Amounts stay
+    float64: float32 cannot hold paise exactly and int64 cents would be no
+    smaller.
+    """
+    for col in df.columns:
+        series = df[col]
+        try:
+            if col == 'Date' and 'DateTime' in df.columns:
+                df[col] = df['DateTime'].dt.normalize()
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            elif col in COMPACT_CATEGORY_COLUMNS:
+                df[col] = series.astype('category')
+            elif series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+                if series.nunique() <= len(series) * COMPACT_CATEGORY_RATIO:
+                    df[col] = series.astype('category')
+        except Exception as e:
+            logger.warning(f"Could not compact column {col}: {e}")
+    return df
+
+
+def memory_report(df):
+    """Rows, total bytes and bytes per column of a frame"""
+    if df is None:
+        return {"rows": 0, "total_bytes": 0, "columns": {}}
+    usage = df.memory_usage(deep=True, index=True)
+    return {
+        "rows": len(df),
+        "total_bytes": int(usage.sum()),
+        "columns": {
+            str(col): {"dtype": str(df[col].dtype), "bytes": int(usage[col])}
+            for col in df.columns
+        }
+    }
+
+
+def iter_json_records(df, chunk_size=5000):
+    """Stream a frame as a JSON array of transaction records, one chunk at a time"""
+    yield b'['
+    for start in range(0, len(df), chunk_size):
+        body = dumps(format_records(df.iloc[start:start + chunk_size]))[1:-1]
+        if body:
+            yield body if start == 0 else b',' + body
+    yield b']'
+
+
+def iter_ndjson_records(df, chunk_size=5000):
+    """Stream a frame as newline-delimited JSON transaction records"""
+    for start in range(0, len(df), chunk_size):
+        records = format_records(df.iloc[start:start + chunk_size])
+        yield b''.join(dumps(record) + b'\n' for record in records)
+
+
+# Trend name -> processed_df column holding its period label
+TREND_LEVELS = {"daily": "Date", "weekly": "Week", "monthly": "Month"}
+
+
+class TrendStore:
+    """Debit rollups per day, week, month and category.
+
+    Rollups are built-in groupby sums and counts, so merging in another
+    batch of transactions only groups that batch and adds it to the
+    totals already held.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Drop all rollups"""
+        # level -> DataFrame(Amount, Count) indexed by period
+        self.totals = {}
+        # level -> DataFrame(Amount, Count) indexed by (period, Category)
+        self.by_category = {}
+        # DataFrame(Amount, Count) indexed by Category
+        self.category_totals = None
+
+    @staticmethod
+    def _rollup(amounts, keys):
+        rollup = amounts.groupby(keys, observed=True).agg(['sum', 'count'])
+        rollup.columns = ['Amount', 'Count']
+        # Plain labels, so rollups of categorical and string frames still align
+        if isinstance(rollup.index, pd.MultiIndex):
+            rollup.index = rollup.index.set_levels([level.astype(object) for level in rollup.index.levels])
+        else:
+            rollup.index = rollup.index.astype(object)
+        return rollup
+
+    @staticmethod
+    def _merge(current, update):
+        if current is None or len(current) == 0:
+            return update
+        merged = current.add(update, fill_value=0).sort_index()
+        merged['Count'] = merged['Count'].astype('int64')
+        return merged
+
+    def add(self, frame):
+        """Merge the debit transactions of a processed frame into the rollups"""
+        debit = frame.loc[frame['Amount'] < 0]
+        if len(debit) == 0:
+            return
+
+        amounts = debit['Amount'].abs()
+        for level, column in TREND_LEVELS.items():
+            self.totals[level] = self._merge(
+                self.totals.get(level), self._rollup(amounts, debit[column]))
+            self.by_category[level] = self._merge(
+                self.by_category.get(level), self._rollup(amounts, [debit[column], debit['Category']]))
+
+        self.category_totals = self._merge(self.category_totals, self._rollup(amounts, debit['Category']))
+
+    def category_sums(self):
+        """Total debit amount per category"""
+        if self.category_totals is None:
+            return {}
+        return self.category_totals['Amount'].round(2).to_dict()
+
+    @staticmethod
+    def _records(totals):
+        return [
+            {"Period": str(period.date()) if isinstance(period, pd.Timestamp) else str(period), "Amount": float(amount)}
+            for period, amount in totals['Amount'].items()
+        ]
+
+    def trends(self, category=None, start_date=None, end_date=None):
+        """Trend records for every level, optionally for one category and a day range"""
+        trends = {level: [] for level in TREND_LEVELS}
+        if not self.totals:
+            return trends
+
+        if start_date is None and end_date is None:
+            for level in TREND_LEVELS:
+                if category is None:
+                    totals = self.totals[level]
+                else:
+                    rollup = self.by_category[level]
+                    totals = rollup.xs(category, level='Category') if category in rollup.index.get_level_values('Category') else rollup.iloc[:0]
+                trends[level] = self._records(totals)
+            return trends
+
+        # A day range cuts weeks and months, so regroup the daily rollup
+        daily = self.by_category['daily'] if category is not None else self.totals['daily']
+        if category is not None:
+            if category not in daily.index.get_level_values('Category'):
+                return trends
+            daily = daily.xs(category, level='Category')
+
+        days = pd.to_datetime(pd.Series(daily.index, index=daily.index))
+        in_range = pd.Series(True, index=daily.index)
+        if start_date is not None:
+            in_range &= days >= start_date
+        if end_date is not None:
+            in_range &= days <= end_date
+        daily = daily.loc[in_range.to_numpy()]
+        days = days.loc[in_range.to_numpy()]
+
+        trends['daily'] = self._records(daily)
+        trends['weekly'] = self._records(daily.groupby(days.dt.to_period('W').astype(str).to_numpy()).sum())
+        trends['monthly'] = self._records(daily.groupby(days.dt.to_period('M').astype(str).to_numpy()).sum())
+        return trends
+
+
+class FilterIndex:
+    """Lookups built once per dataset so /filter never copies processed_df.
+
+    Dates and absolute amounts are kept as sorted arrays for binary-search
+    range queries, categories as integer codes, and transaction details as
+    their distinct lowercased strings, so a keyword is matched once per
+    distinct string rather than once per row. The TOP_K largest rows of each
+    category and merchant (transaction details) are kept as well.
+    """
+
+    def __init__(self, df, keyword_cache_size=64):
+        self.size = len(df)
+
+        # NaT/NaN never satisfy a range, so they are left out of the sorted views
+        self.dates = pd.to_datetime(df['DateTime'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        self.date_positions = np.flatnonzero(~np.isnat(self.dates))
+        self.date_positions = self.date_positions[np.argsort(self.dates[self.date_positions], kind='stable')]
+        self.sorted_dates = self.dates[self.date_positions]
+        # Undated rows are listed last, newest row position first
+        self.undated_positions = np.flatnonzero(np.isnat(self.dates))[::-1]
+
+        self.amounts = pd.to_numeric(df['AbsAmount'], errors='coerce').to_numpy(dtype='float64')
+        self.amount_positions = np.flatnonzero(~np.isnan(self.amounts))
+        self.amount_positions = self.amount_positions[np.argsort(self.amounts[self.amount_positions], kind='stable')]
+        self.sorted_amounts = self.amounts[self.amount_positions]
+        # Overall TOP_K, ordered like the per-group lists: only the rows tied
+        # with or above the K-th largest amount need sorting
+        cutoff = max(len(self.sorted_amounts) - TOP_K, 0)
+        if len(self.sorted_amounts) > 0:
+            cutoff = np.searchsorted(self.sorted_amounts, self.sorted_amounts[cutoff], side='left')
+        candidates = self.amount_positions[cutoff:]
+        self.overall_top = candidates[np.lexsort((candidates, -self.amounts[candidates]))][:TOP_K]
+
+        self.category_codes, categories = pd.factorize(df['Category'])
+        self.category_lookup = {category: code for code, category in enumerate(categories)}
+        self.category_positions = np.argsort(self.category_codes, kind='stable')
+        self.sorted_category_codes = self.category_codes[self.category_positions]
+
+        details = df['Transaction Details']
+        if isinstance(details.dtype, pd.CategoricalDtype):
+            # Lowercase each distinct string once; categories may collapse when lowered
+            lowered_codes, lowered = pd.factorize(details.cat.categories.astype(str).str.lower())
+            codes = details.cat.codes.to_numpy()
+            self.detail_codes = np.where(codes >= 0, lowered_codes[codes], -1)
+            self.details = pd.Series(lowered)
+        else:
+            self.detail_codes, lowered = pd.factorize(details.astype(str).str.lower())
+            self.details = pd.Series(lowered)
+        self.keyword_cache = OrderedDict()
+        self.keyword_cache_size = keyword_cache_size
+
+        self.category_top = self._group_top(self.category_codes, len(categories))
+        # Merchants are the exact transaction details strings
+        if not isinstance(details.dtype, pd.CategoricalDtype):
+            details = details.astype(str)
+        merchant_codes, merchants = pd.factorize(details)
+        self.merchant_lookup = {str(merchant): code for code, merchant in enumerate(merchants)}
+        self.merchant_top = self._group_top(merchant_codes, len(merchants))
+
+    def _group_top(self, codes, group_count):
+        """Positions of the TOP_K largest amounts per group code, with offsets.
+
+        Group g owns positions[offsets[g]:offsets[g + 1]], largest first and
+        earlier rows first on ties.
+        """
+        valid = np.flatnonzero((codes >= 0) & ~np.isnan(self.amounts))
+        order = valid[np.lexsort((valid, -self.amounts[valid], codes[valid]))]
+        group_codes = codes[order]
+        starts = np.searchsorted(group_codes, np.arange(group_count), side='left')
+        rank = np.arange(len(order)) - starts[group_codes]
+        keep = rank < TOP_K
+        counts = np.bincount(group_codes[keep], minlength=group_count)
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        return order[keep], offsets
+
+    def largest(self):
+        """Position of the largest absolute amount (first on ties), or None"""
+        if len(self.sorted_amounts) == 0:
+            return None
+        first = np.searchsorted(self.sorted_amounts, self.sorted_amounts[-1], side='left')
+        return self.amount_positions[first]
+
+    def top(self, category=None, merchant=None, limit=TOP_K):
+        """Positions of the largest transactions, optionally in one category or merchant.
+
+        Merchant wins when both are given; unknown names give no rows. Every
+        view lists equal amounts in row order.
+        """
+        if merchant is not None:
+            positions, offsets = self.merchant_top
+            code = self.merchant_lookup.get(merchant)
+        elif category is not None:
+            positions, offsets = self.category_top
+            code = self.category_lookup.get(category)
+        else:
+            return self.overall_top[:limit]
+
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return positions[offsets[code]:offsets[code + 1]][:limit]
+
+    def _keyword_hits(self, keyword):
+        """Boolean match per distinct details string, cached per keyword"""
+        if keyword in self.keyword_cache:
+            self.keyword_cache.move_to_end(keyword)
+            return self.keyword_cache[keyword]
+
+        # Typing extends the keyword: a plain-text keyword can only match
+        # strings that already matched any cached keyword it contains
+        candidates = np.ones(len(self.details), dtype=bool)
+        if re.escape(keyword) == keyword:
+            for previous, hits in self.keyword_cache.items():
+                if previous in keyword and re.escape(previous) == previous:
+                    candidates &= hits
+
+        hits = np.zeros(len(self.details), dtype=bool)
+        hits[candidates] = self.details[candidates].str.contains(keyword, na=False).to_numpy()
+
+        self.keyword_cache[keyword] = hits
+        if len(self.keyword_cache) > self.keyword_cache_size:
+            self.keyword_cache.popitem(last=False)
+        return hits
+
+    @staticmethod
+    def date_bounds(filters):
+        """(start, end) Timestamps of the date filters; values that don't parse are skipped.
+
+        Timezone-aware values are converted to UTC and compared as naive times.
+        """
+        bounds = []
+        for key in ('start_date', 'end_date'):
+            bound = None
+            if filters.get(key):
+                try:
+                    bound = pd.Timestamp(filters[key])
+                    if bound is pd.NaT:
+                        raise ValueError(f"not a date: {filters[key]!r}")
+                    if bound.tzinfo is not None:
+                        bound = bound.tz_convert(None)
+                except Exception as e:
+                    logger.warning(f"Could not apply {key} filter: {e}")
+                    bound = None
+            bounds.append(bound)
+        return tuple(bounds)
+
+    def select(self, filters, date_bounds=None):
+        """Row positions matching the filters in original order, or None for all rows.
+
+        date_bounds is the result of date_bounds(filters) when the caller already has it.
+        """
+        # Each active filter contributes (candidate positions or None, check on positions)
+        lookups = []
+
+        if filters.get('min_amount') or filters.get('max_amount'):
+            lo, hi = 0, len(self.sorted_amounts)
+            min_amt, max_amt = -np.inf, np.inf
+            if filters.get('min_amount'):
+                try:
+                    min_amt = float(filters['min_amount'])
+                    lo = np.searchsorted(self.sorted_amounts, min_amt, side='left')
+                except Exception as e:
+                    logger.warning(f"Could not apply min_amount filter: {e}")
+            if filters.get('max_amount'):
+                try:
+                    max_amt = float(filters['max_amount'])
+                    hi = np.searchsorted(self.sorted_amounts, max_amt, side='right')
+                except Exception as e:
+                    logger.warning(f"Could not apply max_amount filter: {e}")
+            if min_amt > -np.inf or max_amt < np.inf:
+                lookups.append((
+                    self.amount_positions[lo:max(lo, hi)],
+                    lambda p, a=min_amt, b=max_amt: (self.amounts[p] >= a) & (self.amounts[p] <= b)
+                ))
+
+        if filters.get('start_date') or filters.get('end_date'):
+            if date_bounds is None:
+                date_bounds = self.date_bounds(filters)
+            lo, hi = 0, len(self.sorted_dates)
+            start, end = None, None
+            if date_bounds[0] is not None:
+                start = date_bounds[0].to_datetime64().astype('datetime64[ns]')
+                lo = np.searchsorted(self.sorted_dates, start, side='left')
+            if date_bounds[1] is not None:
+                end = (date_bounds[1] + timedelta(days=1)).to_datetime64().astype('datetime64[ns]')
+                hi = np.searchsorted(self.sorted_dates, end, side='left')
+            if start is not None or end is not None:
+                def date_check(p, a=start, b=end):
+                    keep = ~np.isnat(self.dates[p])
+                    if a is not None:
+                        keep &= self.dates[p] >= a
+                    if b is not None:
+                        keep &= self.dates[p] < b
+                    return keep
+                lookups.append((self.date_positions[lo:max(lo, hi)], date_check))
+
+        if filters.get('category') and filters['category'] != 'All':
+            code = self.category_lookup.get(filters['category'], -2)
+            lo = np.searchsorted(self.sorted_category_codes, code, side='left')
+            hi = np.searchsorted(self.sorted_category_codes, code, side='right')
+            lookups.append((self.category_positions[lo:hi], lambda p, c=code: self.category_codes[p] == c))
+
+        if filters.get('keyword'):
+            try:
+                hits = self._keyword_hits(filters['keyword'].lower())
+                lookups.append((None, lambda p, h=hits: h[self.detail_codes[p]]))
+            except Exception as e:
+                logger.warning(f"Could not apply keyword filter: {e}")
+
+        if not lookups:
+            return None
+
+        # Start from the narrowest index range and check the other filters on it
+        ranged = [lookup for lookup in lookups if lookup[0] is not None]
+        if ranged:
+            start_lookup = min(ranged, key=lambda lookup: len(lookup[0]))
+            positions = start_lookup[0]
+        else:
+            start_lookup = None
+            positions = np.arange(self.size)
+
+        for lookup in lookups:
+            if lookup is not start_lookup and len(positions) > 0:
+                positions = positions[lookup[1](positions)]
+
+        return np.sort(positions)
+
+    def _cursor_for(self, position):
+        """Opaque cursor naming a row by its DateTime and position"""
+        if np.isnat(self.dates[position]):
+            return f"NaT:{position}"
+        return f"{self.dates[position].astype('int64')}:{position}"
+
+    def page(self, selected, cursor=None, limit=RECORD_LIMIT):
+        """One page of rows, newest first, that come after a cursor.
+
+        Rows are ordered by (DateTime, row position) descending with undated
+        rows last. selected restricts the rows (None for all). Returns the
+        page positions and the cursor for the next page, or None at the end.
+        Raises ValueError for a malformed cursor.
+        """
+        keep = None
+        if selected is not None:
+            keep = np.zeros(self.size, dtype=bool)
+            keep[selected] = True
+
+        # Dated rows still to visit are sorted_dates[:end], walked backwards
+        end = len(self.sorted_dates)
+        undated_start = 0
+        if cursor:
+            stamp, _, position = cursor.partition(':')
+            position = int(position)
+            if stamp == 'NaT':
+                end = 0
+                undated_start = np.searchsorted(-self.undated_positions, -position, side='right')
+            else:
+                stamp = np.datetime64(int(stamp), 'ns')
+                lo = np.searchsorted(self.sorted_dates, stamp, side='left')
+                hi = np.searchsorted(self.sorted_dates, stamp, side='right')
+                end = lo + np.searchsorted(self.date_positions[lo:hi], position, side='left')
+
+        # One extra row tells whether another page exists
+        wanted = limit + 1
+        block_size = max(4 * wanted, 4096)
+        chunks = []
+        found = 0
+        while end > 0 and found < wanted:
+            start = max(0, end - block_size)
+            block = self.date_positions[start:end][::-1]
+            if keep is not None:
+                block = block[keep[block]]
+            chunks.append(block[:wanted - found])
+            found += len(chunks[-1])
+            end = start
+
+        if found < wanted:
+            block = self.undated_positions[undated_start:]
+            if keep is not None:
+                block = block[keep[block]]
+            chunks.append(block[:wanted - found])
+
+        positions = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.intp)
+        if len(positions) > limit:
+            positions = positions[:limit]
+            return positions, self._cursor_for(positions[-1])
+        return positions, None
+
+
+class TransactionAnalyzer:
+    def __init__(self, compact=False):
         self.df = None
+        # Convert processed data with compact_frame after each load
+        self.compact = compact
+        # Date formats, failed date rows and (for several files) duplicates of the last load
+        self.load_report = None
         self.processed_df = None
+        self.categorizer = KeywordCategorizer(CATEGORY_KEYWORDS)
+        # (path, mtime_ns, size, sha256) of the file behind processed_df
+        self.source_key = None
+        self.analysis_cache = None
+        # Encoded /filter results by filter parameters, least recently used first
+        self.filter_cache = OrderedDict()
+        self.trend_store = TrendStore()
+        self.filter_index = None
+        # (id of processed_df, bytes) so the deep measurement runs once per dataset
+        self.memory_bytes = (None, 0)
+        self.lock = threading.RLock()
+
+    def memory_report(self):
+        """Rows, total bytes and per-column bytes of processed_df"""
+        report = memory_report(self.processed_df)
+        self.memory_bytes = (id(self.processed_df), report["total_bytes"])
+        return report
+
+    def version(self):
+        """Content hash of the loaded source file, or None when nothing is loaded"""
+        if self.source_key is None or self.processed_df is None:
+            return None
+        return self.source_key[3]
+
+    def memory_usage(self):
+        """Bytes held by processed_df"""
+        if self.processed_df is None:
+            return 0
+        if self.memory_bytes[0] != id(self.processed_df):
+            self.memory_bytes = (id(self.processed_df), int(self.processed_df.memory_usage(deep=True).sum()))
+        return self.memory_bytes[1]
+
+    @staticmethod
+    def _stat_key(filename):
+        """Cheap identity of a file: absolute path, mtime and size.
         
-    def load_excel_file(self, filename='data.xlsx'):
+        For a directory of statements the mtime slot holds a digest of every
+        file's name, mtime and size, so adding, removing or touching any of
+        them changes the key.
+        """
+        if os.path.isdir(filename):
+            listing = hashlib.sha256()
+            total_size = 0
+            for path in TransactionAnalyzer.statement_files(filename):
+                stat = os.stat(path)
+                listing.update(f"{os.path.basename(path)}:{stat.st_mtime_ns}:{stat.st_size};".encode('utf-8'))
+                total_size += stat.st_size
+            return (os.path.abspath(filename), listing.hexdigest(), total_size)
+        stat = os.stat(filename)
+        return (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _content_hash(filename):
+        """SHA-256 of the file contents, read in blocks; of every file's name and hash for a directory"""
+        digest = hashlib.sha256()
+        if os.path.isdir(filename):
+            for path in TransactionAnalyzer.statement_files(filename):
+                digest.update(f"{os.path.basename(path)}:{TransactionAnalyzer._content_hash(path)};".encode('utf-8'))
+            return digest.hexdigest()
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def statement_files(directory):
+        """Statement files of a directory in name order"""
+        return sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(DATA_EXTENSIONS) and not name.startswith(('.', '~$'))
+        )
+
+    def load_if_changed(self, filename='data.xlsx'):
+        """Reuse the processed dataset unless the file changed on disk"""
+        with self.lock:
+            try:
+                if not os.path.exists(filename):
+                    logger.error(f"File not found: {filename}")
+                    return False, f"File not found: {filename}"
+
+                if self.source_key is not None and self.processed_df is not None:
+                    stat_key = self._stat_key(filename)
+                    if stat_key == self.source_key[:3]:
+                        return True, "Using cached data"
+
+                    # Touched but not modified - keep the data, remember the new stat
+                    if stat_key[0] == self.source_key[0] and self._content_hash(filename) == self.source_key[3]:
+                        self.source_key = stat_key + (self.source_key[3],)
+                        return True, "Using cached data"
+
+                if os.path.isdir(filename):
+                    return self.load_directory(filename)
+                if filename.lower().endswith(('.xlsx', '.csv')):
+                    return self.load_file_chunked(filename)
+                return self.load_excel_file(filename)
+
+            except Exception as e:
+                logger.error(f"Error checking cached data: {e}")
+                return False, f"Error loading file: {str(e)}"
+        
+    @staticmethod
+    def _snapshot_path(filename):
+        """Location of the columnar snapshot for a source file"""
+        return filename + SNAPSHOT_SUFFIX
+
+    def _snapshot_fingerprint(self):
+        """Hash of everything besides the source file that shapes processed_df"""
+        settings = {
+            "version": PROCESSING_VERSION,
+            "keywords": self.categorizer.category_keywords,
+            "date_formats": DATE_FORMATS,
+            "time_formats": TIME_FORMATS,
+            "compact": self.compact
+        }
+        return hashlib.sha256(json.dumps(settings, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def _load_snapshot(self, filename):
+        """Memory-map processed_df from its snapshot if it is not older than the source.
+
+        Snapshots whose fingerprint (see _snapshot_fingerprint) differs were
+        written by other code, keywords or compact setting and are not used.
+        """
+        snapshot = self._snapshot_path(filename)
+        if not HAS_PYARROW or not os.path.exists(snapshot):
+            return False
+
+        try:
+            if os.stat(snapshot).st_mtime_ns < os.stat(filename).st_mtime_ns:
+                logger.info(f"Snapshot is older than {filename}, reading Excel instead")
+                return False
+
+            with metrics.timer('snapshot_load'):
+                table = feather.read_table(snapshot, memory_map=True)
+                metadata = (table.schema.metadata or {}).get(SNAPSHOT_METADATA_KEY)
+                metadata = json.loads(metadata) if metadata else {}
+                if metadata.get('fingerprint') != self._snapshot_fingerprint():
+                    logger.info(f"Snapshot {snapshot} was written with other settings, reprocessing")
+                    return False
+                self.processed_df = table.to_pandas()
+            self.load_report = metadata.get('load_report')
+            self.df = None
+            self.analysis_cache = None
+            self.filter_cache = OrderedDict()
+            self._rebuild_indexes()
+            logger.info(f"Loaded {len(self.processed_df)} processed rows from snapshot {snapshot}")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Could not read snapshot {snapshot}: {e}")
+            return False
+
+    def _save_snapshot(self, filename):
+        """Write processed_df, derived columns included, as an uncompressed Feather file"""
+        if not HAS_PYARROW or self.processed_df is None:
+            return
+
+        snapshot = self._snapshot_path(filename)
+        tmp_path = snapshot + '.tmp'
+        try:
+            # Uncompressed so that later reads can memory-map the columns directly
+            with metrics.timer('snapshot_save'):
+                table = pa.Table.from_pandas(self.processed_df.reset_index(drop=True), preserve_index=False)
+                metadata = json.dumps({"fingerprint": self._snapshot_fingerprint(), "load_report": self.load_report}, default=_json_default)
+                table = table.replace_schema_metadata({**(table.schema.metadata or {}), SNAPSHOT_METADATA_KEY: metadata.encode('utf-8')})
+                feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, snapshot)
+            logger.info(f"Saved processed data snapshot to {snapshot}")
+        except Exception as e:
+            logger.warning(f"Could not save snapshot {snapshot}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def move_source(self, filename):
+        """Move the loaded file and its snapshot to filename without reprocessing"""
+        with self.lock:
+            source = self.source_key[0]
+            target = os.path.abspath(filename)
+            # os.replace keeps the mtime, so the key stays valid under the new name
+            self.source_key = (target,) + self.source_key[1:]
+            os.replace(source, target)
+            if not os.path.isdir(target) and os.path.exists(self._snapshot_path(source)):
+                os.replace(self._snapshot_path(source), self._snapshot_path(target))
+
+    def load_directory(self, directory, progress=None, workers=None):
+        """Load every statement file of a directory as one dataset (see load_files)"""
+        if not os.path.isdir(directory):
+            return False, f"Not a directory: {directory}"
+        
+        paths = self.statement_files(directory)
+        if not paths:
+            return False, f"No statement files in {directory}"
+        
+        source_key = self._stat_key(directory) + (self._content_hash(directory),)
+        success, message = self.load_files(paths, progress, workers)
+        if success:
+            self.source_key = source_key
+        return success, message
+
+    def load_files(self, paths, progress=None, workers=None):
+        """Load several statement files as one dataset.
+        
+        Files are parsed and categorized in a process pool, one file per
+        task, then concatenated in the order given. Rows repeated across
+        overlapping statements (same DEDUPE_COLUMNS) are kept once; undated
+        rows are never merged. progress is called as progress(rows, None)
+        as files finish.
+        """
+        try:
+            logger.info(f"Loading {len(paths)} statement files")
+            self.source_key = None
+            self._report_progress(progress, 0, None)
+            
+            workers = min(len(paths), workers or app.config['LOAD_WORKERS'])
+            frames = [None] * len(paths)
+            reports = []
+            rows = 0
+            try:
+                with metrics.timer('load_files'):
+                    if workers <= 1:
+                        for i, path in enumerate(paths):
+                            frames[i], report = load_statement(path)
+                            reports.append(report)
+                            rows += len(frames[i])
+                            self._report_progress(progress, rows, None)
+                    else:
+                        # spawn, since forking a threaded server process is unsafe
+                        context = multiprocessing.get_context('spawn')
+                        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                            futures = {pool.submit(load_statement, path): i for i, path in enumerate(paths)}
+                            for future in as_completed(futures):
+                                i = futures[future]
+                                frames[i], report = future.result()
+                                reports.append(report)
+                                rows += len(frames[i])
+                                self._report_progress(progress, rows, None)
+            except Exception as e:
+                logger.error(f"Error loading statement files: {e}")
+                return False, f"Could not read file: {str(e)}"
+            
+            file_ids = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+            with metrics.timer('concat'):
+                processed_df = pd.concat(frames, ignore_index=True)
+            del frames
+            
+            with metrics.timer('dedupe'):
+                # Number identical rows within each file, so a file's own repeats
+                # survive and only copies of them in other files are dropped
+                keys = processed_df[DEDUPE_COLUMNS].copy()
+                occurrence = keys.assign(file=file_ids).groupby(
+                    DEDUPE_COLUMNS + ['file'], sort=False, dropna=False, observed=True).cumcount()
+                duplicated = keys.assign(occurrence=occurrence).duplicated() & processed_df['DateTime'].notna()
+                del keys
+                if duplicated.any():
+                    processed_df = processed_df.loc[~duplicated].reset_index(drop=True)
+            logger.info(f"Dropped {int(duplicated.sum())} rows repeated across statement files")
+            
+            # Categoricals of different files only combine as objects; compact again
+            if self.compact:
+                with metrics.timer('compact'):
+                    processed_df = compact_frame(processed_df)
+            else:
+                for col in processed_df.columns:
+                    if isinstance(processed_df[col].dtype, pd.CategoricalDtype):
+                        processed_df[col] = processed_df[col].astype(object)
+                processed_df['Date'] = processed_df['DateTime'].dt.date
+            
+            with self.lock:
+                self.df = None
+                self.processed_df = processed_df
+                self.analysis_cache = None
+                self.filter_cache = OrderedDict()
+                self.load_report = {
+                    "date_format": next((report["date_format"] for report in reports if report), None),
+                    "time_format": next((report["time_format"] for report in reports if report), None),
+                    "failed_rows": sum(report["failed_rows"] for report in reports if report),
+                    "examples": [example for report in reports if report for example in report["examples"]][:5],
+                    "duplicates_dropped": int(duplicated.sum()),
+                    "files": len(paths)
+                }
+                self._rebuild_indexes()
+            self._report_progress(progress, len(processed_df), len(processed_df))
+            
+            logger.info(f"Successfully processed {len(processed_df)} transactions from {len(paths)} files")
+            return True, "Data processed successfully"
+            
+        except Exception as e:
+            logger.error(f"Error loading statement files: {e}")
+            return False, f"Error loading files: {str(e)}"
+
+    def load_excel_file(self, filename='data.xlsx', use_snapshot=True):
         """Load and process Excel file with robust error handling"""
         try:
             logger.info(f"Loading Excel file: {filename}")
@@ -87,9 +1136,17 @@ class TransactionAnalyzer:
                 logger.error(f"File not found: {filename}")
                 return False, f"File not found: {filename}"
             
+            self.source_key = None
+            source_key = self._stat_key(filename) + (self._content_hash(filename),)
+            
+            if use_snapshot and self._load_snapshot(filename):
+                self.source_key = source_key
+                return True, "Data loaded from snapshot"
+            
             # Read Excel file
             try:
-                self.df = pd.read_excel(filename, engine='openpyxl')
+                with metrics.timer('read'):
+                    self.df = pd.read_excel(filename, engine='openpyxl')
             except Exception as e:
                 logger.error(f"Error reading Excel file: {e}")
                 return False, f"Could not read Excel file: {str(e)}"
@@ -99,142 +1156,165 @@ class TransactionAnalyzer:
             
             # Process the data
             success, message = self._process_data()
+            if success:
+                self.source_key = source_key
+                self._save_snapshot(filename)
             return success, message
             
         except Exception as e:
             logger.error(f"Error loading Excel file: {e}")
             return False, f"Error loading file: {str(e)}"
     
+    @staticmethod
+    def _iter_chunks(filename, chunk_size):
+        """Yield (raw chunk, estimated total rows) from an .xlsx or .csv file"""
+        if filename.lower().endswith('.csv'):
+            # Line count is only used for progress and dummy dates
+            with open(filename, 'rb') as f:
+                total_rows = max(sum(block.count(b'\n') for block in iter(lambda: f.read(1024 * 1024), b'')) - 1, 0)
+            for chunk in pd.read_csv(filename, chunksize=chunk_size):
+                yield chunk, total_rows
+            return
+        
+        workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [str(col) if col is not None else f"Unnamed: {i}" for i, col in enumerate(header)]
+            total_rows = max((sheet.max_row or 1) - 1, 0)
+            
+            batch = []
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                batch.append(row)
+                if len(batch) >= chunk_size:
+                    yield TextParser(batch, names=columns).read(), total_rows
+                    batch = []
+            if batch:
+                yield TextParser(batch, names=columns).read(), total_rows
+        finally:
+            workbook.close()
+    
+    @staticmethod
+    def _report_progress(callback, rows, total_rows):
+        if callback is not None:
+            callback(rows, total_rows)
+    
+    def load_file_chunked(self, filename='data.xlsx', chunk_size=INGEST_CHUNK_SIZE, progress=None, use_snapshot=True):
+        """Stream an .xlsx or .csv file through normalization in bounded chunks.
+        
+        Only one raw chunk is held at a time; each normalized chunk is merged
+        into fresh trend rollups as it arrives and the finished dataset is
+        swapped in at the end. progress is called as progress(rows, total_rows).
+        """
+        try:
+            logger.info(f"Loading file in chunks of {chunk_size} rows: {filename}")
+            
+            if not os.path.exists(filename):
+                logger.error(f"File not found: {filename}")
+                return False, f"File not found: {filename}"
+            
+            self.source_key = None
+            source_key = self._stat_key(filename) + (self._content_hash(filename),)
+            
+            if use_snapshot and self._load_snapshot(filename):
+                self.source_key = source_key
+                self._report_progress(progress, len(self.processed_df), len(self.processed_df))
+                return True, "Data loaded from snapshot"
+            
+            self._report_progress(progress, 0, None)
+            
+            columns = None
+            chunks = []
+            trend_store = TrendStore()
+            rows = 0
+            total_rows = None
+            try:
+                for raw_chunk, total_rows in metrics.timed_iter('read', self._iter_chunks(filename, chunk_size)):
+                    raw_chunk.columns = raw_chunk.columns.astype(str).str.strip()
+                    if columns is None:
+                        logger.info(f"Column names: {list(raw_chunk.columns)}")
+                        with metrics.timer('detect_columns'):
+                            columns = detect_columns(raw_chunk)
+                    
+                    chunk = self._normalize_frame(raw_chunk, columns, rows, total_rows)
+                    with metrics.timer('trends'):
+                        trend_store.add(chunk)
+                    chunks.append(chunk)
+                    rows += len(chunk)
+                    metrics.increment('analyzer_rows_processed_total', value=len(chunk))
+                    self._report_progress(progress, rows, max(total_rows, rows))
+            except Exception as e:
+                logger.error(f"Error reading file: {e}")
+                return False, f"Could not read file: {str(e)}"
+            
+            if rows == 0:
+                return False, "No data to process"
+            self._report_dates(columns)
+            
+            with metrics.timer('concat'):
+                processed_df = pd.concat(chunks, ignore_index=True)
+            del chunks
+            if self.compact:
+                with metrics.timer('compact'):
+                    processed_df = compact_frame(processed_df)
+            
+            try:
+                with metrics.timer('indexes'):
+                    filter_index = FilterIndex(processed_df)
+            except Exception as e:
+                filter_index = None
+                logger.warning(f"Could not build filter index: {e}")
+            
+            # Swap the finished dataset in
+            with self.lock:
+                self.df = None
+                self.processed_df = processed_df
+                self.analysis_cache = None
+                self.filter_cache = OrderedDict()
+                self.trend_store = trend_store
+                self.filter_index = filter_index
+                self.source_key = source_key
+            self._save_snapshot(filename)
+            self._report_progress(progress, rows, rows)
+            
+            logger.info(f"Successfully processed {rows} transactions")
+            return True, "Data processed successfully"
+            
+        except Exception as e:
+            logger.error(f"Error loading file: {e}")
+            return False, f"Error loading file: {str(e)}"
+    
     def _process_data(self):
         """Process and clean the loaded data - FIXED VERSION"""
         try:
+            self.analysis_cache = None
+            self.filter_cache = OrderedDict()
+            
             if self.df is None or len(self.df) == 0:
                 return False, "No data to process"
             
             # Make a copy for processing
-            self.processed_df = self.df.copy()
+            raw_df = self.df.copy()
             
             # Clean column names
-            self.processed_df.columns = self.processed_df.columns.str.strip()
-            
-            # **FIX 1: Handle DateTime columns properly**
-            # Look for Date and Time columns separately and combine them
-            date_col = None
-            time_col = None
-            
-            for col in self.processed_df.columns:
-                col_lower = col.lower().strip()
-                if col_lower == 'date':
-                    date_col = col
-                elif col_lower == 'time':
-                    time_col = col
-                elif 'datetime' in col_lower:
-                    date_col = col
-                    break
-            
-            # Create DateTime column
-            if date_col is not None and time_col is not None:
-                try:
-                    # Combine Date and Time columns
-                    date_str = self.processed_df[date_col].astype(str)
-                    time_str = self.processed_df[time_col].astype(str)
-                    datetime_str = date_str + ' ' + time_str
-                    self.processed_df['DateTime'] = pd.to_datetime(datetime_str, errors='coerce')
-                    logger.info(f"Combined {date_col} and {time_col} into DateTime")
-                except Exception as e:
-                    logger.warning(f"Could not combine date/time columns: {e}")
-                    self._create_dummy_datetime()
-            elif date_col is not None:
-                try:
-                    self.processed_df['DateTime'] = pd.to_datetime(self.processed_df[date_col], errors='coerce')
-                    logger.info(f"Converted {date_col} to DateTime")
-                except Exception as e:
-                    logger.warning(f"Could not parse date column: {e}")
-                    self._create_dummy_datetime()
-            else:
-                logger.warning("No date column found, creating dummy dates")
-                self._create_dummy_datetime()
-            
-            # **FIX 2: Handle Amount column with proper error checking**
-            amount_col = None
-            for col in self.processed_df.columns:
-                if 'amount' in col.lower():
-                    amount_col = col
-                    break
-            
-            if amount_col is not None:
-                try:
-                    # Clean and convert amount column
-                    amount_series = self.processed_df[amount_col].astype(str)
-                    # Remove currency symbols and whitespace
-                    amount_series = amount_series.str.replace(r'[₹,$,\s]', '', regex=True)
-                    # Handle empty strings
-                    amount_series = amount_series.replace('', '0')
-                    amount_series = amount_series.replace('nan', '0')
-                    self.processed_df['Amount'] = pd.to_numeric(amount_series, errors='coerce')
-                    # Fill any remaining NaN values with 0
-                    self.processed_df['Amount'] = self.processed_df['Amount'].fillna(0)
-                    logger.info(f"Converted {amount_col} to numeric Amount")
-                except Exception as e:
-                    logger.error(f"Error converting amount column: {e}")
-                    self.processed_df['Amount'] = 0
-            else:
-                logger.warning("No amount column found, setting all amounts to 0")
-                self.processed_df['Amount'] = 0
-            
-            # **FIX 3: Handle Transaction Details column**
-            details_col = None
-            for col in self.processed_df.columns:
-                col_lower = col.lower()
-                if 'transaction' in col_lower and 'detail' in col_lower:
-                    details_col = col
-                    break
-            
-            if details_col is not None:
-                self.processed_df['Transaction Details'] = self.processed_df[details_col].astype(str)
-            else:
-                # Use first available text column or create dummy data
-                text_cols = []
-                for col in self.processed_df.columns:
-                    if self.processed_df[col].dtype == 'object':
-                        text_cols.append(col)
-                
-                if len(text_cols) > 0:
-                    self.processed_df['Transaction Details'] = self.processed_df[text_cols[0]].astype(str)
-                    logger.info(f"Used {text_cols[0]} as Transaction Details")
-                else:
-                    self.processed_df['Transaction Details'] = 'Unknown Transaction'
-                    logger.warning("No transaction details found, using dummy data")
+            raw_df.columns = raw_df.columns.str.strip()
             
-            # Fill missing values
-            self.processed_df['Transaction Details'] = self.processed_df['Transaction Details'].fillna('Unknown Transaction')
+            with metrics.timer('detect_columns'):
+                columns = detect_columns(raw_df)
+            processed_df = self._normalize_frame(raw_df, columns)
+            self._report_dates(columns)
+            if self.compact:
+                with metrics.timer('compact'):
+                    processed_df = compact_frame(processed_df)
+            self.processed_df = processed_df
+            metrics.increment('analyzer_rows_processed_total', value=len(processed_df))
             
-            # **FIX 4: Add derived columns with proper error handling**
-            try:
-                self.processed_df['Category'] = self.processed_df['Transaction Details'].apply(self._categorize_transaction)
-                
-                # **FIX 5: Handle Type column with .loc to avoid ambiguity**
-                self.processed_df['Type'] = 'Unknown'
-                credit_mask = self.processed_df['Amount'] > 0
-                debit_mask = self.processed_df['Amount'] < 0
-                
-                self.processed_df.loc[credit_mask, 'Type'] = 'Credit'
-                self.processed_df.loc[debit_mask, 'Type'] = 'Debit'
-                
-                self.processed_df['AbsAmount'] = self.processed_df['Amount'].abs()
-                
-                # Add time-based columns
-                self.processed_df['Date'] = self.processed_df['DateTime'].dt.date
-                self.processed_df['Month'] = self.processed_df['DateTime'].dt.to_period('M').astype(str)
-                self.processed_df['Week'] = self.processed_df['DateTime'].dt.to_period('W').astype(str)
-                self.processed_df['DayOfWeek'] = self.processed_df['DateTime'].dt.day_name()
-                
-            except Exception as e:
-                logger.error(f"Error adding derived columns: {e}")
-                # Set default values
-                self.processed_df['Category'] = '🔄 Miscellaneous'
-                self.processed_df['Type'] = 'Unknown'
-                self.processed_df['AbsAmount'] = 0
+            self._rebuild_indexes()
             
             logger.info(f"Successfully processed {len(self.processed_df)} transactions")
             return True, "Data processed successfully"
@@ -243,37 +1323,123 @@ class TransactionAnalyzer:
             logger.error(f"Error processing data: {e}")
             return False, f"Error processing data: {str(e)}"
     
-    def _create_dummy_datetime(self):
-        """Create dummy datetime data"""
+    def _parse_datetimes(self, frame, columns, row_offset=0, total_rows=None):
+        """DateTime for a raw frame (see parse_datetimes), or dummy dates without a date column"""
+        with metrics.timer('datetime'):
+            datetimes = parse_datetimes(frame, columns)
+        if datetimes is None:
+            return self._dummy_datetimes(len(frame), row_offset, total_rows)
+        return datetimes
+    
+    def _report_dates(self, columns):
+        """Log and remember how many date and time values could not be parsed"""
+        report = date_report(columns)
+        if report["failed_rows"]:
+            metrics.increment('analyzer_datetime_failures_total', value=report["failed_rows"])
+            logger.warning(f"{report['failed_rows']} date/time values could not be parsed, e.g. {report['examples'][:3]}")
+        self.load_report = report
+        return report
+    
+    def _normalize_frame(self, frame, columns, row_offset=0, total_rows=None):
+        """Add DateTime, Amount, details and derived columns to a raw frame.
+        
+        Works on a whole file or on one chunk of it; row_offset and
+        total_rows place the chunk when dummy dates have to be generated.
+        """
+        # Create DateTime column
         try:
-            base_date = datetime.now() - timedelta(days=len(self.processed_df))
-            self.processed_df['DateTime'] = [
-                base_date + timedelta(days=i) 
-                for i in range(len(self.processed_df))
-            ]
+            frame['DateTime'] = self._parse_datetimes(frame, columns, row_offset, total_rows)
+        except Exception as e:
+            logger.warning(f"Could not parse date/time columns: {e}")
+            frame['DateTime'] = self._dummy_datetimes(len(frame), row_offset, total_rows)
+        
+        amount_col = columns['amount']
+        if amount_col is not None:
+            try:
+                with metrics.timer('amount'):
+                    frame['Amount'] = clean_amounts(frame[amount_col])
+            except Exception as e:
+                logger.error(f"Error converting amount column: {e}")
+                frame['Amount'] = 0
+        else:
+            frame['Amount'] = 0
+        
+        if columns['details'] is not None:
+            frame['Transaction Details'] = frame[columns['details']].astype(str)
+        else:
+            frame['Transaction Details'] = 'Unknown Transaction'
+        
+        # Fill missing values
+        frame['Transaction Details'] = frame['Transaction Details'].fillna('Unknown Transaction')
+        
+        # **FIX 4: Add derived columns with proper error handling**
+        try:
+            with metrics.timer('categorize'):
+                frame['Category'] = self.categorizer.categorize_series(frame['Transaction Details'])
+            
+            # **FIX 5: Handle Type column with .loc to avoid ambiguity**
+            frame['Type'] = 'Unknown'
+            credit_mask = frame['Amount'] > 0
+            debit_mask = frame['Amount'] < 0
+            
+            frame.loc[credit_mask, 'Type'] = 'Credit'
+            frame.loc[debit_mask, 'Type'] = 'Debit'
+            
+            frame['AbsAmount'] = frame['Amount'].abs()
+            
+            # Add time-based columns
+            with metrics.timer('derived'):
+                frame['Date'] = frame['DateTime'].dt.date
+                frame['Month'] = frame['DateTime'].dt.to_period('M').astype(str)
+                frame['Week'] = frame['DateTime'].dt.to_period('W').astype(str)
+                frame['DayOfWeek'] = frame['DateTime'].dt.day_name()
+            
+        except Exception as e:
+            logger.error(f"Error adding derived columns: {e}")
+            # Set default values
+            frame['Category'] = MISC_CATEGORY
+            frame['Type'] = 'Unknown'
+            frame['AbsAmount'] = 0
+        
+        return frame
+    
+    def _rebuild_indexes(self):
+        """Rebuild the trend rollups and filter index from processed_df"""
+        self.trend_store.reset()
+        try:
+            with metrics.timer('trends'):
+                self.trend_store.add(self.processed_df)
+        except Exception as e:
+            logger.warning(f"Could not build trend rollups: {e}")
+        
+        self.filter_index = None
+        try:
+            with metrics.timer('indexes'):
+                self.filter_index = FilterIndex(self.processed_df)
+        except Exception as e:
+            logger.warning(f"Could not build filter index: {e}")
+    
+    def _dummy_datetimes(self, count, row_offset=0, total_rows=None):
+        """Create dummy datetime data, one day apart and ending yesterday"""
+        try:
+            total_rows = max(total_rows or 0, row_offset + count)
+            base_date = datetime.now() - timedelta(days=total_rows)
             logger.info("Created dummy datetime data")
+            return [
+                base_date + timedelta(days=row_offset + i)
+                for i in range(count)
+            ]
         except Exception as e:
             logger.error(f"Error creating dummy dates: {e}")
-            self.processed_df['DateTime'] = datetime.now()
+            return datetime.now()
     
     def _categorize_transaction(self, details):
         """Categorize transaction based on keywords in details"""
         try:
-            if pd.isna(details) or details == '' or str(details).lower() == 'nan':
-                return "🔄 Miscellaneous"
-            
-            details_lower = str(details).lower().strip()
-            
-            # Check each category
-            for category, keywords in CATEGORY_KEYWORDS.items():
-                for keyword in keywords:
-                    if keyword.lower() in details_lower:
-                        return category
-            
-            return "🔄 Miscellaneous"
+            return self.categorizer.categorize(details)
         except Exception as e:
             logger.error(f"Error categorizing transaction: {e}")
-            return "🔄 Miscellaneous"
+            return MISC_CATEGORY
     
     def get_full_analysis(self):
         """Get complete analysis of the data"""
@@ -281,6 +1447,12 @@ class TransactionAnalyzer:
             if self.processed_df is None or len(self.processed_df) == 0:
                 return {"error": "No data available for analysis"}
             
+            if self.analysis_cache is not None:
+                metrics.increment('analyzer_cache_requests_total', {"cache": "analysis", "result": "hit"})
+                return self.analysis_cache
+            metrics.increment('analyzer_cache_requests_total', {"cache": "analysis", "result": "miss"})
+            started = time.perf_counter()
+            
             # **FIX 6: Use .loc[] to avoid ambiguous boolean operations**
             # Basic statistics
             debit_mask = self.processed_df['Amount'] < 0
@@ -291,29 +1463,27 @@ class TransactionAnalyzer:
             transaction_count = len(self.processed_df)
             
             # Category analysis (only for debit transactions)
-            debit_df = self.processed_df.loc[debit_mask].copy()
-            if len(debit_df) > 0:
-                debit_df['AbsAmount'] = debit_df['Amount'].abs()
-                categories = debit_df.groupby('Category')['AbsAmount'].sum().round(2).to_dict()
-            else:
-                categories = {}
+            categories = self.trend_store.category_sums()
             
             # Trends analysis
             trends = self._calculate_trends()
             
-            # Largest transaction
-            if len(self.processed_df) > 0:
-                largest_idx = self.processed_df['AbsAmount'].idxmax()
+            # Largest transaction, read from the sorted amount view
+            if self.filter_index is None:
+                self.filter_index = FilterIndex(self.processed_df)
+            largest_pos = self.filter_index.largest()
+            if largest_pos is not None:
+                largest = self.processed_df.iloc[largest_pos]
                 largest_transaction = {
-                    "amount": float(self.processed_df.loc[largest_idx, 'Amount']),
-                    "details": str(self.processed_df.loc[largest_idx, 'Transaction Details']),
-                    "date": self.processed_df.loc[largest_idx, 'DateTime'].strftime('%Y-%m-%d') if pd.notna(self.processed_df.loc[largest_idx, 'DateTime']) else 'Unknown'
+                    "amount": float(largest['Amount']),
+                    "details": str(largest['Transaction Details']),
+                    "date": largest['DateTime'].strftime('%Y-%m-%d') if pd.notna(largest['DateTime']) else 'Unknown'
                 }
             else:
                 largest_transaction = {"amount": 0, "details": "No transactions", "date": "Unknown"}
             
             # Prepare filtered data (last 100 transactions)
-            filtered_data = self._prepare_transaction_data(limit=100)
+            filtered_data = self._prepare_transaction_data(limit=RECORD_LIMIT)
             
             result = {
                 "totals": {
@@ -332,6 +1502,8 @@ class TransactionAnalyzer:
                 }
             }
             
+            self.analysis_cache = result
+            metrics.observe('analyzer_stage_seconds', time.perf_counter() - started, {"stage": "analysis"})
             logger.info("Full analysis completed successfully")
             return result
             
@@ -340,60 +1512,66 @@ class TransactionAnalyzer:
             return {"error": f"Analysis failed: {str(e)}"}
     
     def _calculate_trends(self):
-        """Calculate daily, weekly, and monthly trends"""
+        """Daily, weekly, and monthly trends from the precomputed rollups"""
         try:
-            trends = {"daily": [], "weekly": [], "monthly": []}
-            
-            if self.processed_df is None or len(self.processed_df) == 0:
-                return trends
+            return self.trend_store.trends()
+        except Exception as e:
+            logger.error(f"Error calculating trends: {e}")
+            return {"daily": [], "weekly": [], "monthly": []}
+    
+    def _filtered_trends(self, filters, filtered_df, date_bounds):
+        """Trends for a filtered view, read from the rollups when the filters allow it.
+
+        date_bounds are the parsed date filters that selected filtered_df.
+        """
+        try:
+            if filters.get('min_amount') or filters.get('max_amount') or filters.get('keyword'):
+                # Row-level filters: roll up just the remaining rows
+                store = TrendStore()
+                store.add(filtered_df)
+                return store.trends()
             
-            # **FIX 7: Use .loc[] for boolean indexing**
-            debit_mask = self.processed_df['Amount'] < 0
-            debit_data = self.processed_df.loc[debit_mask]
+            category = filters.get('category')
+            if not category or category == 'All':
+                category = None
+            start_date, end_date = date_bounds
             
-            if len(debit_data) > 0:
-                # Daily trends
-                try:
-                    daily_spending = debit_data.groupby('Date')['Amount'].apply(lambda x: abs(x.sum())).reset_index()
-                    daily_spending['Date'] = daily_spending['Date'].astype(str)
-                    trends["daily"] = daily_spending.rename(columns={'Date': 'Period', 'Amount': 'Amount'}).to_dict('records')
-                except Exception as e:
-                    logger.warning(f"Could not calculate daily trends: {e}")
-                
-                # Weekly trends
-                try:
-                    weekly_spending = debit_data.groupby('Week')['Amount'].apply(lambda x: abs(x.sum())).reset_index()
-                    trends["weekly"] = weekly_spending.rename(columns={'Week': 'Period', 'Amount': 'Amount'}).to_dict('records')
-                except Exception as e:
-                    logger.warning(f"Could not calculate weekly trends: {e}")
-                
-                # Monthly trends
-                try:
-                    monthly_spending = debit_data.groupby('Month')['Amount'].apply(lambda x: abs(x.sum())).reset_index()
-                    trends["monthly"] = monthly_spending.rename(columns={'Month': 'Period', 'Amount': 'Amount'}).to_dict('records')
-                except Exception as e:
-                    logger.warning(f"Could not calculate monthly trends: {e}")
+            # The daily rollup can only answer whole-day ranges
+            for bound in (start_date, end_date):
+                if bound is not None and bound != bound.normalize():
+                    store = TrendStore()
+                    store.add(filtered_df)
+                    return store.trends()
             
-            return trends
+            return self.trend_store.trends(category, start_date, end_date)
             
         except Exception as e:
-            logger.error(f"Error calculating trends: {e}")
+            logger.warning(f"Could not calculate filtered trends: {e}")
             return {"daily": [], "weekly": [], "monthly": []}
     
-    def _prepare_transaction_data(self, limit=None):
-        """Prepare transaction data for frontend"""
+    def _prepare_transaction_data(self, limit=None, frame=None, selected=None):
+        """Prepare transaction data for frontend.
+
+        Without a frame the newest rows of processed_df (restricted to the
+        selected positions) are read from the date-sorted view.
+        """
         try:
-            if self.processed_df is None or len(self.processed_df) == 0:
+            if frame is None:
+                frame = self.processed_df
+                if frame is not None and limit and self.filter_index is not None:
+                    available_cols = [col for col in RECORD_COLUMNS if col in frame.columns]
+                    positions, _ = self.filter_index.page(selected, None, limit)
+                    return format_records(frame[available_cols].take(positions))
+            if frame is None or len(frame) == 0:
                 return []
             
             # Select relevant columns that exist
-            required_cols = ['DateTime', 'Transaction Details', 'Category', 'Amount', 'Type']
-            available_cols = [col for col in required_cols if col in self.processed_df.columns]
+            available_cols = [col for col in RECORD_COLUMNS if col in frame.columns]
             
             if len(available_cols) == 0:
                 return []
             
-            df_subset = self.processed_df[available_cols].copy()
+            df_subset = frame[available_cols]
             
             # Sort by date (newest first)
             try:
@@ -404,22 +1582,7 @@ class TransactionAnalyzer:
             if limit and len(df_subset) > limit:
                 df_subset = df_subset.head(limit)
             
-            # Convert to records
-            records = df_subset.to_dict('records')
-            
-            # Format for JSON serialization
-            for record in records:
-                for key, value in record.items():
-                    if pd.isna(value):
-                        record[key] = None
-                    elif isinstance(value, (np.integer, np.floating)):
-                        record[key] = float(value)
-                    elif key == 'DateTime' and hasattr(value, 'strftime'):
-                        record[key] = value.strftime('%Y-%m-%d %H:%M:%S')
-                    else:
-                        record[key] = str(value)
-            
-            return records
+            return format_records(df_subset)
             
         except Exception as e:
             logger.error(f"Error preparing transaction data: {e}")
@@ -431,59 +1594,18 @@ class TransactionAnalyzer:
             if self.processed_df is None or len(self.processed_df) == 0:
                 return {"error": "No data available"}
             
-            filtered_df = self.processed_df.copy()
-            
-            # **FIX 8: Use .loc[] for all filtering operations**
-            # Apply amount filters
-            if filters.get('min_amount'):
-                try:
-                    min_amt = float(filters['min_amount'])
-                    amount_mask = filtered_df['AbsAmount'] >= min_amt
-                    filtered_df = filtered_df.loc[amount_mask]
-                except Exception as e:
-                    logger.warning(f"Could not apply min_amount filter: {e}")
-            
-            if filters.get('max_amount'):
-                try:
-                    max_amt = float(filters['max_amount'])
-                    amount_mask = filtered_df['AbsAmount'] <= max_amt
-                    filtered_df = filtered_df.loc[amount_mask]
-                except Exception as e:
-                    logger.warning(f"Could not apply max_amount filter: {e}")
-            
-            # Apply date filters
-            if filters.get('start_date'):
-                try:
-                    start_date = pd.to_datetime(filters['start_date'])
-                    date_mask = filtered_df['DateTime'] >= start_date
-                    filtered_df = filtered_df.loc[date_mask]
-                except Exception as e:
-                    logger.warning(f"Could not apply start_date filter: {e}")
-            
-            if filters.get('end_date'):
-                try:
-                    end_date = pd.to_datetime(filters['end_date']) + timedelta(days=1)
-                    date_mask = filtered_df['DateTime'] < end_date
-                    filtered_df = filtered_df.loc[date_mask]
-                except Exception as e:
-                    logger.warning(f"Could not apply end_date filter: {e}")
+            if self.filter_index is None:
+                self.filter_index = FilterIndex(self.processed_df)
             
-            # Apply category filter
-            if filters.get('category') and filters['category'] != 'All':
-                try:
-                    category_mask = filtered_df['Category'] == filters['category']
-                    filtered_df = filtered_df.loc[category_mask]
-                except Exception as e:
-                    logger.warning(f"Could not apply category filter: {e}")
-            
-            # Apply keyword search
-            if filters.get('keyword'):
-                try:
-                    keyword = filters['keyword'].lower()
-                    keyword_mask = filtered_df['Transaction Details'].str.lower().str.contains(keyword, na=False)
-                    filtered_df = filtered_df.loc[keyword_mask]
-                except Exception as e:
-                    logger.warning(f"Could not apply keyword filter: {e}")
+            started = time.perf_counter()
+            # Parsed once so rows and trends skip the same invalid dates
+            date_bounds = FilterIndex.date_bounds(filters)
+            with metrics.timer('filter_select'):
+                positions = self.filter_index.select(filters, date_bounds)
+            if positions is None:
+                filtered_df = self.processed_df
+            else:
+                filtered_df = self.processed_df.take(positions)
             
             # Calculate filtered statistics
             debit_mask = filtered_df['Amount'] < 0
@@ -495,34 +1617,12 @@ class TransactionAnalyzer:
             # Category analysis for filtered data
             debit_filtered = filtered_df.loc[debit_mask]
             if len(debit_filtered) > 0:
-                categories = debit_filtered.groupby('Category')['AbsAmount'].sum().round(2).to_dict()
+                categories = debit_filtered.groupby('Category', observed=True)['AbsAmount'].sum().round(2).to_dict()
             else:
                 categories = {}
             
             # Prepare filtered transaction data
-            filtered_records = []
-            if len(filtered_df) > 0:
-                required_cols = ['DateTime', 'Transaction Details', 'Category', 'Amount', 'Type']
-                available_cols = [col for col in required_cols if col in filtered_df.columns]
-                
-                if len(available_cols) > 0:
-                    subset = filtered_df[available_cols].copy()
-                    try:
-                        subset = subset.sort_values('DateTime', ascending=False).head(100)
-                    except:
-                        subset = subset.head(100)
-                    
-                    filtered_records = subset.to_dict('records')
-                    for record in filtered_records:
-                        for key, value in record.items():
-                            if pd.isna(value):
-                                record[key] = None
-                            elif isinstance(value, (np.integer, np.floating)):
-                                record[key] = float(value)
-                            elif key == 'DateTime' and hasattr(value, 'strftime'):
-                                record[key] = value.strftime('%Y-%m-%d %H:%M:%S')
-                            else:
-                                record[key] = str(value)
+            filtered_records = self._prepare_transaction_data(limit=RECORD_LIMIT, selected=positions)
             
             result = {
                 "totals": {
@@ -532,10 +1632,11 @@ class TransactionAnalyzer:
                 },
                 "categories": categories,
                 "filtered_data": filtered_records,
-                "trends": {"daily": [], "weekly": [], "monthly": []},  # Simplified for filtered data
+                "trends": self._filtered_trends(filters, filtered_df, date_bounds),
                 "transaction_count": len(filtered_df)
             }
             
+            metrics.observe('analyzer_stage_seconds', time.perf_counter() - started, {"stage": "filter"})
             logger.info(f"Applied filters, {len(filtered_df)} transactions remaining")
             return result
             
@@ -543,10 +1644,386 @@ class TransactionAnalyzer:
             logger.error(f"Error applying filters: {e}")
             return {"error": f"Filter application failed: {str(e)}"}
 
-# Global analyzer instance
-analyzer = TransactionAnalyzer()
+    def filter_response_body(self, filters):
+        """apply_filters encoded as JSON bytes, from the filter cache when possible.
+
+        Returns (body, error result); errors are not cached.
+        """
+        key = json.dumps(filters, sort_keys=True, default=str)
+        body = self.filter_cache.get(key)
+        if body is not None:
+            metrics.increment('analyzer_cache_requests_total', {"cache": "filter", "result": "hit"})
+            self.filter_cache.move_to_end(key)
+            return body, None
+        metrics.increment('analyzer_cache_requests_total', {"cache": "filter", "result": "miss"})
+        
+        result = self.apply_filters(filters)
+        if "error" in result:
+            return None, result
+        
+        body = dumps(result)
+        self.filter_cache[key] = body
+        if len(self.filter_cache) > FILTER_CACHE_SIZE:
+            self.filter_cache.popitem(last=False)
+        return body, None
+
+    def transaction_page(self, filters, cursor=None, limit=TRANSACTION_PAGE_SIZE):
+        """Rows for one page of filtered transactions plus the next cursor"""
+        if self.processed_df is None or len(self.processed_df) == 0:
+            return None, None
+        
+        if self.filter_index is None:
+            self.filter_index = FilterIndex(self.processed_df)
+        
+        selected = self.filter_index.select(filters)
+        positions, next_cursor = self.filter_index.page(selected, cursor, limit)
+        
+        available_cols = [col for col in RECORD_COLUMNS if col in self.processed_df.columns]
+        return self.processed_df[available_cols].take(positions), next_cursor
+
+    def top_transactions(self, category=None, merchant=None, limit=TOP_K):
+        """Records of the largest transactions overall, in a category or for a merchant"""
+        if self.processed_df is None or len(self.processed_df) == 0:
+            return []
+        
+        if self.filter_index is None:
+            self.filter_index = FilterIndex(self.processed_df)
+        
+        positions = self.filter_index.top(category, merchant, limit)
+        available_cols = [col for col in RECORD_COLUMNS if col in self.processed_df.columns]
+        return format_records(self.processed_df[available_cols].take(positions))
+
+def load_statement(filename):
+    """Process-pool worker: one statement file as a compact processed frame.
+
+    Runs in a separate process, so it goes through a throwaway analyzer and
+    returns only the frame (compact, so it pickles small) and date report.
+    The file's own snapshot is used and refreshed, so unchanged files of a
+    directory are not parsed again.
+    """
+    worker = TransactionAnalyzer(compact=True)
+    if filename.lower().endswith('.xls'):
+        success, message = worker.load_excel_file(filename)
+    else:
+        success, message = worker.load_file_chunked(filename)
+    if not success:
+        raise ValueError(f"{os.path.basename(filename)}: {message}")
+    return worker.processed_df, worker.load_report
+
+class JobQueue:
+    """Thread pool for analysis jobs with a bounded number of jobs in flight.
+
+    Jobs are plain dicts (id, state, progress, result, error) so they can be
+    returned from /jobs/<id> as they are. Finished jobs are kept until
+    max_finished newer ones have completed.
+    """
+
+    def __init__(self, max_workers=2, max_pending=4, max_finished=100):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis')
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.jobs = OrderedDict()
+        self.max_finished = max_finished
+        self.lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """Queue func(job, *args); returns the job id, or None when the queue is full"""
+        if not self.slots.acquire(blocking=False):
+            return None
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "state": "queued",
+            "progress": {"rows": 0, "total_rows": None},
+            "result": None,
+            "error": None,
+            "created": time.time(),
+            "finished": None
+        }
+        with self.lock:
+            self.jobs[job["id"]] = job
+        self.executor.submit(self._run, job, func, args)
+        return job["id"]
+
+    def _run(self, job, func, args):
+        job["state"] = "running"
+        try:
+            job["result"] = func(job, *args)
+            job["state"] = "done"
+        except Exception as e:
+            logger.error(f"Job {job['id']} failed: {e}")
+            job["error"] = str(e)
+            job["state"] = "failed"
+        finally:
+            job["finished"] = time.time()
+            self.slots.release()
+            self._evict()
+
+    def _evict(self):
+        with self.lock:
+            finished = [job_id for job_id, job in self.jobs.items() if job["finished"] is not None]
+            for job_id in finished[:max(len(finished) - self.max_finished, 0)]:
+                del self.jobs[job_id]
+
+    @staticmethod
+    def progress_callback(job):
+        """Callback for load_file_chunked that records progress on the job"""
+        def report(rows, total_rows):
+            job["progress"] = {"rows": rows, "total_rows": total_rows}
+        return report
+
+    def get(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+
+class AnalyzerRegistry:
+    """One TransactionAnalyzer per dataset id.
+
+    Analyzers are created empty and load their dataset's file lazily on
+    first use. When the processed data of all analyzers exceeds the memory
+    budget the least recently used ones are dropped; their files (and
+    snapshots) stay on disk, so they reload on the next request.
+    """
+
+    def __init__(self, memory_budget):
+        self.memory_budget = memory_budget
+        self.analyzers = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def data_file(dataset_id):
+        """File (or directory of statement files) behind a dataset, or None if nothing was uploaded for it"""
+        if dataset_id == DEFAULT_DATASET:
+            return app.config['DATA_FILE']
+        directory = os.path.join(app.config['DATASET_FOLDER'], dataset_id)
+        if os.path.isdir(directory):
+            return directory
+        for extension in DATA_EXTENSIONS:
+            path = os.path.join(app.config['DATASET_FOLDER'], dataset_id + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    @staticmethod
+    def target_file(dataset_id, extension):
+        """Where an upload with this extension ('' for several files) is stored for a dataset"""
+        if dataset_id == DEFAULT_DATASET:
+            return os.path.join(app.config['UPLOAD_FOLDER'], 'data' + extension)
+        os.makedirs(app.config['DATASET_FOLDER'], exist_ok=True)
+        return os.path.join(app.config['DATASET_FOLDER'], dataset_id + extension)
+
+    def get(self, dataset_id):
+        """Analyzer for a dataset, marked as most recently used"""
+        with self.lock:
+            current = self.analyzers.get(dataset_id)
+            if current is None:
+                current = TransactionAnalyzer(compact=app.config['COMPACT_STORAGE'])
+                self.analyzers[dataset_id] = current
+            self.analyzers.move_to_end(dataset_id)
+            return current
+
+    def swap(self, dataset_id, new_analyzer):
+        """Atomically replace the analyzer serving a dataset"""
+        with self.lock:
+            self.analyzers[dataset_id] = new_analyzer
+            self.analyzers.move_to_end(dataset_id)
+        self.enforce_budget()
+
+    def enforce_budget(self):
+        """Drop least recently used analyzers until the rest fit the memory budget"""
+        with self.lock:
+            total = sum(current.memory_usage() for current in self.analyzers.values())
+            # The most recently used analyzer is always kept
+            while total > self.memory_budget and len(self.analyzers) > 1:
+                dataset_id, evicted = self.analyzers.popitem(last=False)
+                total -= evicted.memory_usage()
+                logger.info(f"Evicted dataset {dataset_id} from memory")
+
+
+def read_data_marker():
+    """Default dataset file named by the marker, or None if there is no usable marker"""
+    try:
+        with open(app.config['DATA_MARKER'], encoding='utf-8') as f:
+            name = f.read().strip()
+    except OSError:
+        return None
+    # Only names written by write_data_marker are accepted
+    if not name or os.path.basename(name) != name:
+        return None
+    path = os.path.join(app.config['UPLOAD_FOLDER'], name)
+    return path if os.path.exists(path) else None
+
+def write_data_marker(data_path):
+    """Record the default dataset file so it survives a restart"""
+    marker = app.config['DATA_MARKER']
+    tmp_path = marker + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(os.path.basename(data_path))
+    os.replace(tmp_path, marker)
+
+# Pick up the file uploaded before the last restart
+app.config['DATA_FILE'] = read_data_marker() or app.config['DATA_FILE']
+
+# Analyzers for all datasets
+registry = AnalyzerRegistry(app.config['ANALYZER_MEMORY_BUDGET'])
+jobs = JobQueue(app.config['ANALYSIS_WORKERS'], app.config['MAX_PENDING_JOBS'])
+
+def request_dataset(default=DEFAULT_DATASET):
+    """Dataset id from the X-Dataset-Id header or ?dataset=, else the default"""
+    dataset_id = request.headers.get('X-Dataset-Id') or request.args.get('dataset') or default
+    if not DATASET_ID_PATTERN.match(dataset_id):
+        raise ValueError("Invalid dataset id")
+    return dataset_id
+
+def load_dataset(dataset_id):
+    """Analyzer for a dataset with its file loaded; returns (analyzer, success, message)"""
+    path = registry.data_file(dataset_id)
+    if path is None:
+        return None, False, f"Unknown dataset: {dataset_id}"
+    
+    current = registry.get(dataset_id)
+    with current.lock:
+        success, message = current.load_if_changed(path)
+    registry.enforce_budget()
+    return current, success, message
+
+def process_upload(job, upload_path, dataset_id):
+    """Job body: analyze an uploaded file, then make it the dataset's data"""
+    try:
+        fresh = TransactionAnalyzer(compact=app.config['COMPACT_STORAGE'])
+        if os.path.isdir(upload_path):
+            success, message = fresh.load_directory(upload_path, progress=JobQueue.progress_callback(job))
+        elif upload_path.lower().endswith('.xls'):
+            success, message = fresh.load_excel_file(upload_path, use_snapshot=False)
+        else:
+            success, message = fresh.load_file_chunked(
+                upload_path, progress=JobQueue.progress_callback(job), use_snapshot=False)
+        
+        if not success:
+            raise ValueError(f"Failed to process uploaded file: {message}")
+        
+        result = fresh.get_full_analysis()
+        # Several files are kept together as a directory
+        extension = '' if os.path.isdir(upload_path) else os.path.splitext(upload_path)[1].lower()
+        data_path = registry.target_file(dataset_id, extension)
+        
+        # Requests that pick up the new analyzer wait until its file is in place
+        with fresh.lock:
+            registry.swap(dataset_id, fresh)
+            if dataset_id == DEFAULT_DATASET:
+                app.config['DATA_FILE'] = data_path
+            else:
+                # A previous upload of another format would shadow this one
+                for other in DATA_EXTENSIONS + ('',):
+                    stale = registry.target_file(dataset_id, other)
+                    if other != extension and os.path.isdir(stale):
+                        shutil.rmtree(stale)
+                    elif other != extension and os.path.exists(stale):
+                        os.remove(stale)
+            if os.path.isdir(data_path):
+                shutil.rmtree(data_path)
+            fresh.move_source(data_path)
+            if dataset_id == DEFAULT_DATASET:
+                write_data_marker(data_path)
+        
+        job["load_report"] = fresh.load_report
+        logger.info(f"Upload job {job['id']} finished: {len(fresh.processed_df)} transactions in dataset {dataset_id}")
+        return result
+        
+    finally:
+        if os.path.isdir(upload_path):
+            shutil.rmtree(upload_path)
+        elif os.path.exists(upload_path):
+            os.remove(upload_path)
+
+def dataset_gauges():
+    """Rows and memory of every loaded dataset, plus registry and job queue state"""
+    with registry.lock:
+        loaded = list(registry.analyzers.items())
+    gauges = [
+        ('analyzer_datasets_loaded', {}, len(loaded)),
+        ('analyzer_memory_budget_bytes', {}, registry.memory_budget),
+        ('analyzer_jobs_pending', {}, sum(1 for job in list(jobs.jobs.values()) if job["state"] in ('queued', 'running'))),
+    ]
+    for dataset_id, current in loaded:
+        frame = current.processed_df
+        gauges.append(('analyzer_dataset_rows', {"dataset": dataset_id}, len(frame) if frame is not None else 0))
+        gauges.append(('analyzer_dataset_memory_bytes', {"dataset": dataset_id}, current.memory_usage()))
+    return gauges
+
+metrics.collectors.append(dataset_gauges)
+
+@app.before_request
+def start_request_metrics():
+    """Note the start time and, when asked and allowed, start profiling the request"""
+    g.request_started = time.perf_counter()
+    g.profiler = None
+    if app.config['PROFILE_REQUESTS'] and request.headers.get('X-Profile'):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            g.profiler = profiler
+        except ValueError as e:
+            # Only one profiler can be active at a time
+            logger.warning(f"Could not profile request: {e}")
+
+# Registered before compress_response so that it runs after it
+@app.after_request
+def record_request_metrics(response):
+    """Count the request, record its duration and write its profile if one was taken"""
+    try:
+        endpoint = request.endpoint or 'unknown'
+        started = g.get('request_started')
+        if started is not None:
+            metrics.observe('http_request_duration_seconds', time.perf_counter() - started, {"endpoint": endpoint})
+        metrics.increment('http_requests_total', {
+            "endpoint": endpoint, "method": request.method, "status": str(response.status_code)
+        })
+        
+        profiler = g.get('profiler')
+        if profiler is not None:
+            profiler.disable()
+            g.profiler = None
+            os.makedirs(app.config['PROFILE_FOLDER'], exist_ok=True)
+            name = f"{endpoint}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.prof"
+            profiler.dump_stats(os.path.join(app.config['PROFILE_FOLDER'], name))
+            response.headers['X-Profile-File'] = name
+            logger.info(f"Wrote request profile {name}")
+        
+    except Exception as e:
+        logger.warning(f"Could not record request metrics: {e}")
+    return response
+
+@app.after_request
+def compress_response(response):
+    """Compress large JSON bodies with brotli or gzip when the client accepts it"""
+    try:
+        if response.mimetype != 'application/json':
+            return response
+        response.vary.add('Accept-Encoding')
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers):
+            return response
+        
+        body = response.get_data()
+        if len(body) < COMPRESS_MIN_SIZE:
+            return response
+        
+        accepted = request.accept_encodings
+        if HAS_BROTLI and accepted['br'] > 0:
+            with metrics.timer('compress'):
+                response.set_data(brotli.compress(body, quality=5))
+            response.headers['Content-Encoding'] = 'br'
+        elif accepted['gzip'] > 0:
+            with metrics.timer('compress'):
+                response.set_data(gzip.compress(body, compresslevel=6))
+            response.headers['Content-Encoding'] = 'gzip'
+        
+    except Exception as e:
+        logger.warning(f"Could not compress response: {e}")
+    return response
 
-# Flask Routes (unchanged)
 @app.route('/')
 def index():
     return send_from_directory('.', 'index.html')
@@ -558,18 +2035,30 @@ def static_files(filename):
 @app.route('/analyze', methods=['GET'])
 def analyze_data():
     try:
-        success, message = analyzer.load_excel_file('data.xlsx')
+        try:
+            dataset_id = request_dataset()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
+        current, success, message = load_dataset(dataset_id)
+        if current is None:
+            return jsonify({"error": message}), 404
         if not success:
             return jsonify({"error": f"Could not load data: {message}"}), 400
         
-        result = analyzer.get_full_analysis()
+        etag = request_etag(current.version(), 'analyze')
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        
+        with current.lock:
+            result = current.get_full_analysis()
         
         if "error" in result:
             return jsonify(result), 400
         
         logger.info("Analysis completed successfully")
-        return jsonify(result)
+        return json_response(result, etag=etag)
         
     except Exception as e:
         logger.error(f"Error in analyze_data: {e}")
@@ -581,44 +2070,216 @@ def upload_file():
         if 'file' not in request.files:
             return jsonify({"error": "No file provided"}), 400
         
-        file = request.files['file']
-        if file.filename == '':
+        # Several files (one statement per account or month) form one dataset
+        files = [file for file in request.files.getlist('file') if file.filename != '']
+        if not files:
             return jsonify({"error": "No file selected"}), 400
         
-        if file and file.filename.lower().endswith(('.xlsx', '.xls')):
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], 'data.xlsx')
-            file.save(filepath)
+        if all(file.filename.lower().endswith(DATA_EXTENSIONS) for file in files):
+            # Uploads without a dataset id start a new dataset
+            try:
+                dataset_id = request_dataset(default=uuid.uuid4().hex)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
             
-            success, message = analyzer.load_excel_file(filepath)
+            # Saved under a private name until its job has processed it
+            upload_name = f"upload-{uuid.uuid4().hex}"
+            if len(files) == 1:
+                filename = secure_filename(files[0].filename)
+                extension = os.path.splitext(filename)[1].lower() or '.xlsx'
+                upload_path = os.path.join(app.config['UPLOAD_FOLDER'], upload_name + extension)
+                files[0].save(upload_path)
+            else:
+                filename = f"{len(files)} files"
+                upload_path = os.path.join(app.config['UPLOAD_FOLDER'], upload_name)
+                os.makedirs(upload_path)
+                for i, file in enumerate(files):
+                    # Numbered, so files with the same name do not overwrite each other
+                    stem, extension = os.path.splitext(file.filename)
+                    file.save(os.path.join(upload_path, f"{i:03d}-{secure_filename(stem)}{extension.lower()}"))
             
-            if not success:
-                return jsonify({"error": f"Failed to process uploaded file: {message}"}), 400
+            job_id = jobs.submit(process_upload, upload_path, dataset_id)
+            if job_id is None:
+                if os.path.isdir(upload_path):
+                    shutil.rmtree(upload_path)
+                else:
+                    os.remove(upload_path)
+                return jsonify({"error": "Too many uploads are being processed, please try again shortly"}), 429
             
-            logger.info(f"File uploaded and processed successfully: {filename}")
-            return jsonify({"message": "File uploaded and processed successfully"}), 200
+            logger.info(f"File uploaded, processing as job {job_id}: {filename}")
+            return jsonify({
+                "message": "File uploaded, processing started",
+                "job_id": job_id,
+                "dataset_id": dataset_id,
+                "status_url": f"/jobs/{job_id}"
+            }), 202
         
-        return jsonify({"error": "Invalid file format. Please upload .xlsx or .xls files only."}), 400
+        return jsonify({"error": "Invalid file format. Please upload .xlsx, .xls or .csv files only."}), 400
         
     except Exception as e:
         logger.error(f"Error in upload_file: {e}")
         return jsonify({"error": f"Upload failed: {str(e)}"}), 500
 
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """State and progress of a background job, with the analysis once it is done"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return json_response(job)
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Stage timings, request counts and dataset gauges in Prometheus format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/memory', methods=['GET'])
+def memory_status():
+    """Memory held by every loaded dataset, with a per-column report for the requested one"""
+    try:
+        dataset_id = request_dataset()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    with registry.lock:
+        loaded = list(registry.analyzers.items())
+    
+    datasets = {name: current.memory_usage() for name, current in loaded}
+    report = None
+    for name, current in loaded:
+        if name == dataset_id:
+            with current.lock:
+                report = current.memory_report()
+    
+    return jsonify({
+        "budget_bytes": registry.memory_budget,
+        "total_bytes": sum(datasets.values()),
+        "datasets": datasets,
+        "dataset": dataset_id,
+        "report": report
+    })
+
 @app.route('/filter', methods=['POST'])
 def filter_data():
     try:
+        try:
+            dataset_id = request_dataset()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
         filters = request.json or {}
-        result = analyzer.apply_filters(filters)
+        current, success, message = load_dataset(dataset_id)
+        if current is None:
+            return jsonify({"error": message}), 404
+        if not success:
+            return jsonify({"error": f"Could not load data: {message}"}), 400
         
-        if "error" in result:
-            return jsonify(result), 400
+        etag = request_etag(current.version(), 'filter', filters)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        
+        with current.lock:
+            body, error = current.filter_response_body(filters)
+        
+        if error is not None:
+            return jsonify(error), 400
         
-        return jsonify(result)
+        return json_response(body, etag=etag)
         
     except Exception as e:
         logger.error(f"Error in filter_data: {e}")
         return jsonify({"error": f"Filter failed: {str(e)}"}), 500
 
+@app.route('/transactions', methods=['GET', 'POST'])
+def list_transactions():
+    """Cursor-paginated transactions, newest first, streamed as NDJSON or JSON"""
+    try:
+        params = request.args.to_dict()
+        if request.method == 'POST':
+            params.update(request.get_json(silent=True) or {})
+        
+        try:
+            limit = int(params.get('limit') or TRANSACTION_PAGE_SIZE)
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        limit = min(max(limit, 1), MAX_TRANSACTION_PAGE_SIZE)
+        
+        output_format = params.get('format', 'ndjson')
+        if output_format not in ('ndjson', 'json'):
+            return jsonify({"error": "format must be 'ndjson' or 'json'"}), 400
+        
+        try:
+            dataset_id = request_dataset()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        current, success, message = load_dataset(dataset_id)
+        if current is None:
+            return jsonify({"error": message}), 404
+        if not success:
+            return jsonify({"error": f"Could not load data: {message}"}), 400
+        
+        with current.lock:
+            try:
+                page_df, next_cursor = current.transaction_page(params, params.get('cursor'), limit)
+            except ValueError:
+                return jsonify({"error": "Invalid cursor"}), 400
+        
+        if page_df is None:
+            return jsonify({"error": "No data available"}), 400
+        
+        if output_format == 'ndjson':
+            response = Response(iter_ndjson_records(page_df), mimetype='application/x-ndjson')
+        else:
+            def generate():
+                yield b'{"transactions":'
+                yield from iter_json_records(page_df)
+                yield b',"next_cursor":' + dumps(next_cursor) + b'}'
+            response = Response(generate(), mimetype='application/json')
+        
+        response.headers['X-Next-Cursor'] = next_cursor or ''
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error in list_transactions: {e}")
+        return jsonify({"error": f"Could not list transactions: {str(e)}"}), 500
+
+@app.route('/top', methods=['GET'])
+def top_transactions():
+    """Largest transactions, optionally for one category or merchant"""
+    try:
+        try:
+            limit = int(request.args.get('limit') or TOP_K)
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        limit = min(max(limit, 1), TOP_K)
+        
+        category = request.args.get('category') or None
+        if category == 'All':
+            category = None
+        merchant = request.args.get('merchant') or None
+        
+        try:
+            dataset_id = request_dataset()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        current, success, message = load_dataset(dataset_id)
+        if current is None:
+            return jsonify({"error": message}), 404
+        if not success:
+            return jsonify({"error": f"Could not load data: {message}"}), 400
+        
+        with current.lock:
+            records = current.top_transactions(category, merchant, limit)
+        
+        return json_response({"transactions": records, "count": len(records)})
+        
+    except Exception as e:
+        logger.error(f"Error in top_transactions: {e}")
+        return jsonify({"error": f"Could not get top transactions: {str(e)}"}), 500
+
 if __name__ == '__main__':
     logger.info("Starting Transaction Analyzer Flask App")
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,408 @@
+"""Benchmark and load test for the Transaction Analyzer Flask app.
+
+Generates synthetic statements shaped like the exported UPI workbook (Date,
+Time, Transaction Details, Amount, ...), times each analyzer stage with its
+peak memory, load-tests /analyze and /filter with concurrent clients through
+the Flask test client, and writes everything to a JSON baseline.
+
+    python benchmark.py --sizes 10000,100000 --output baseline.json
+    python benchmark.py --compare baseline.json --output new.json
+
+Workbooks are cached in --workdir, so repeated runs skip generation. Excel
+holds at most 1,048,576 rows per sheet; larger sizes are written as CSV.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import openpyxl
+
+import analyze
+
+# psutil gives RSS on every platform; /proc is read directly without it
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("benchmark")
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 5_000_000]
+EXCEL_MAX_ROWS = 1_048_575
+BASELINE_VERSION = 1
+
+COLUMNS = [
+    'Date', 'Time', 'Transaction Details', 'Other Transaction Details (UPI ID or A/c No)',
+    'Your Account', 'Amount', 'UPI Ref No.', 'Order ID', 'Remarks', 'Tags', 'Comment'
+]
+
+# Merchants containing CATEGORY_KEYWORDS, so every category gets rows
+MERCHANTS = [
+    'Swiggy', 'Zomato', 'Dominos Pizza', 'Cafe Coffee Day', 'Amazon', 'Flipkart', 'Myntra',
+    'Uber', 'Ola Cabs', 'Rapido', 'Netflix', 'Spotify', 'BookMyShow', 'Airtel Recharge',
+    'Jio Prepaid', 'Electricity Board', 'Apollo Pharmacy', 'BigBasket', 'Blinkit',
+    'HPCL Petrol Pump', 'IRCTC', 'MakeMyTrip', 'Zerodha', 'Groww', 'LIC Premium'
+]
+PEOPLE = [f'Person {i}' for i in range(2000)]
+ACCOUNTS = ['Punjab National Bank - 49', 'State Bank of India - 12', 'HDFC Bank - 77']
+TAGS = ['#🥘 Food', '#🛒 Groceries', '#🚕 Travel', '#💡 Bills', '#🎬 Entertainment']
+
+FILTER_SETS = {
+    "category": {"category": "🥘 Food & Dining"},
+    "date_range": {"start_date": "2024-01-01", "end_date": "2024-06-30"},
+    "amount_range": {"min_amount": "100", "max_amount": "5000"},
+    "keyword": {"keyword": "swiggy"},
+    "combined": {"category": "🛍 Shopping", "start_date": "2024-03-01", "min_amount": "50", "keyword": "amazon"},
+}
+
+
+def generate_frame(rows, seed=0):
+    """Synthetic statement with the raw column shapes of the UPI export"""
+    rng = np.random.default_rng(seed)
+
+    seconds = rng.integers(0, 730 * 86400, rows)
+    stamps = pd.Timestamp('2023-09-01') + pd.to_timedelta(np.sort(seconds)[::-1], unit='s')
+
+    # A third of the rows pay merchants, the rest are person-to-person
+    merchant = rng.random(rows) < 0.35
+    credit = rng.random(rows) < 0.15
+    names = np.where(merchant, rng.choice(MERCHANTS, rows), rng.choice(PEOPLE, rows))
+    details = np.where(credit, 'Received from ', 'Paid to ').astype(object) + names.astype(object)
+
+    amounts = np.round(rng.lognormal(5, 1.2, rows), 2)
+    amounts = np.where(credit, amounts, -amounts)
+
+    frame = pd.DataFrame({
+        'Date': stamps.strftime('%d/%m/%Y'),
+        'Time': stamps.strftime('%H:%M:%S'),
+        'Transaction Details': details,
+        'Other Transaction Details (UPI ID or A/c No)': pd.Series(names).str.lower().str.replace(' ', '') + '@ybl',
+        'Your Account': rng.choice(ACCOUNTS, rows),
+        'Amount': pd.Series(amounts).map('{:.2f}'.format),
+        'UPI Ref No.': rng.integers(10**11, 10**12, rows),
+        'Order ID': None,
+        'Remarks': None,
+        'Tags': np.where(rng.random(rows) < 0.3, rng.choice(TAGS, rows), None),
+        'Comment': None,
+    })
+    return frame[COLUMNS]
+
+
+def write_workbook(frame, path):
+    """Write a frame as a one-sheet workbook with openpyxl in write-only mode"""
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(frame.columns))
+    for row in frame.itertuples(index=False, name=None):
+        sheet.append([None if value is None or value != value else value for value in row])
+    workbook.save(path)
+
+
+def statement_file(rows, workdir, fmt='xlsx'):
+    """Path of a cached synthetic statement, generated on first use"""
+    if fmt == 'xlsx' and rows > EXCEL_MAX_ROWS:
+        logger.info(f"{rows} rows exceed the Excel sheet limit, using CSV")
+        fmt = 'csv'
+
+    os.makedirs(workdir, exist_ok=True)
+    path = os.path.join(workdir, f"statement-{rows}.{fmt}")
+    if not os.path.exists(path):
+        logger.info(f"Generating {path}")
+        start = time.perf_counter()
+        frame = generate_frame(rows)
+        tmp_path = path + '.tmp'
+        if fmt == 'csv':
+            frame.to_csv(tmp_path, index=False)
+        else:
+            write_workbook(frame, tmp_path)
+        os.replace(tmp_path, path)
+        logger.info(f"Generated {path} in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def current_rss():
+    """Resident set size of this process in bytes, or None if unknown"""
+    if HAS_PSUTIL:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class PeakMemory:
+    """Samples RSS in a background thread while a stage runs"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.start_rss = None
+        self.peak_rss = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            rss = current_rss()
+            if rss is not None:
+                self.peak_rss = max(self.peak_rss or 0, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.start_rss = current_rss()
+        self.peak_rss = self.start_rss
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        rss = current_rss()
+        if rss is not None:
+            self.peak_rss = max(self.peak_rss or 0, rss)
+        return False
+
+
+def time_stage(results, name, func, repeat=1):
+    """Run func repeat times, record seconds and memory under results[name], return its last value"""
+    timings = []
+    value = None
+    with PeakMemory() as memory:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            value = func()
+            timings.append(time.perf_counter() - start)
+
+    results[name] = {
+        "seconds": min(timings),
+        "mean_seconds": statistics.mean(timings),
+        "repeat": repeat,
+        "peak_rss_bytes": memory.peak_rss,
+        "peak_delta_bytes": memory.peak_rss - memory.start_rss if memory.start_rss is not None else None,
+    }
+    logger.info(f"  {name}: {min(timings) * 1000:.1f} ms, peak +{(results[name]['peak_delta_bytes'] or 0) / 2**20:.1f} MB")
+    return value
+
+
+def check(success_message):
+    """Fail loudly when an analyzer stage reports failure"""
+    success, message = success_message
+    if not success:
+        raise RuntimeError(message)
+    return success_message
+
+
+def benchmark_stages(path, repeat):
+    """Time the analyzer stages on one statement file"""
+    results = {}
+    is_excel = path.endswith('.xlsx')
+
+    analyzer = analyze.TransactionAnalyzer(compact=analyze.app.config['COMPACT_STORAGE'])
+    if is_excel:
+        analyzer.df = time_stage(results, "read_excel", lambda: pd.read_excel(path, engine='openpyxl'))
+    else:
+        analyzer.df = time_stage(results, "read_csv", lambda: pd.read_csv(path))
+    time_stage(results, "_process_data", lambda: check(analyzer._process_data()))
+    analyzer.df = None
+
+    if is_excel:
+        fresh = analyze.TransactionAnalyzer(compact=analyze.app.config['COMPACT_STORAGE'])
+        time_stage(results, "load_excel_file", lambda: check(fresh.load_excel_file(path, use_snapshot=False)))
+        del fresh
+
+    analyzer = analyze.TransactionAnalyzer(compact=analyze.app.config['COMPACT_STORAGE'])
+    time_stage(results, "load_file_chunked", lambda: check(analyzer.load_file_chunked(path, use_snapshot=False)))
+
+    if analyze.HAS_PYARROW:
+        snapshot = analyzer._snapshot_path(path)
+        if os.path.exists(snapshot):
+            time_stage(results, "snapshot_load", lambda: analyzer._load_snapshot(path))
+
+    def full_analysis():
+        analyzer.analysis_cache = None
+        return analyzer.get_full_analysis()
+    time_stage(results, "get_full_analysis", full_analysis, repeat)
+    time_stage(results, "get_full_analysis_cached", analyzer.get_full_analysis, repeat)
+
+    for name, filters in FILTER_SETS.items():
+        time_stage(results, f"apply_filters[{name}]", lambda f=filters: analyzer.apply_filters(f), repeat)
+
+    results["rows"] = len(analyzer.processed_df)
+    results["processed_bytes"] = analyzer.memory_usage()
+    return results
+
+
+def load_test(path, clients, requests_per_client):
+    """Concurrent /analyze and /filter requests against a dataset holding path"""
+    dataset_id = 'benchmark-' + os.path.basename(path).replace('.', '-')
+    extension = os.path.splitext(path)[1]
+    target = os.path.join(analyze.app.config['DATASET_FOLDER'], dataset_id + extension)
+    os.makedirs(analyze.app.config['DATASET_FOLDER'], exist_ok=True)
+    if not os.path.exists(target):
+        shutil.copyfile(path, target)
+
+    headers = {'X-Dataset-Id': dataset_id, 'Accept-Encoding': 'gzip'}
+    client = analyze.app.test_client()
+    # Warm up: load the dataset once so the test measures serving, not loading
+    response = client.get('/analyze', headers=headers)
+    if response.status_code != 200:
+        raise RuntimeError(f"/analyze failed with {response.status_code}: {response.get_data(as_text=True)[:200]}")
+
+    requests = [('GET', '/analyze', None)] + [('POST', '/filter', filters) for filters in FILTER_SETS.values()]
+    latencies = {path: [] for _, path, _ in requests}
+    errors = []
+    revalidated = []
+
+    def run_client(index):
+        local = analyze.app.test_client()
+        etags = {}
+        for n in range(requests_per_client):
+            method, url, filters = requests[(index + n) % len(requests)]
+            request_headers = dict(headers)
+            key = (url, json.dumps(filters, sort_keys=True))
+            # Half the clients revalidate like a polling dashboard
+            if index % 2 and key in etags:
+                request_headers['If-None-Match'] = etags[key]
+            start = time.perf_counter()
+            if method == 'GET':
+                response = local.get(url, headers=request_headers)
+            else:
+                response = local.post(url, json=filters, headers=request_headers)
+            elapsed = time.perf_counter() - start
+            if response.status_code not in (200, 304):
+                errors.append(response.status_code)
+                continue
+            if response.status_code == 304:
+                revalidated.append(url)
+            if response.headers.get('ETag'):
+                etags[key] = response.headers['ETag']
+            latencies[url].append(elapsed)
+
+    start = time.perf_counter()
+    with PeakMemory() as memory, ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(run_client, range(clients)))
+    wall = time.perf_counter() - start
+
+    total = sum(len(values) for values in latencies.values())
+    results = {
+        "clients": clients,
+        "requests": total,
+        "errors": len(errors),
+        "not_modified": len(revalidated),
+        "seconds": wall,
+        "requests_per_second": total / wall if wall else None,
+        "peak_rss_bytes": memory.peak_rss,
+        "endpoints": {}
+    }
+    for url, values in latencies.items():
+        if values:
+            ordered = sorted(values)
+            results["endpoints"][url] = {
+                "count": len(values),
+                "p50_ms": ordered[len(ordered) // 2] * 1000,
+                "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+    logger.info(f"  load test: {total} requests in {wall:.2f}s ({results['requests_per_second']:.0f}/s), {len(errors)} errors")
+
+    with analyze.registry.lock:
+        analyze.registry.analyzers.pop(dataset_id, None)
+    return results
+
+
+def compare(previous, current, threshold):
+    """Print stages that got slower or faster than threshold between two baselines"""
+    print(f"\n{'size':>10} {'stage':<32} {'before':>10} {'after':>10} {'change':>8}")
+    regressions = 0
+    for size, entry in current["sizes"].items():
+        before_stages = previous.get("sizes", {}).get(size, {}).get("stages", {})
+        for name, stats in entry["stages"].items():
+            if not isinstance(stats, dict) or name not in before_stages:
+                continue
+            before, after = before_stages[name]["seconds"], stats["seconds"]
+            change = after / before - 1 if before else 0
+            flag = ''
+            if change > threshold:
+                flag = '  slower'
+                regressions += 1
+            elif change < -threshold:
+                flag = '  faster'
+            print(f"{size:>10} {name:<32} {before * 1000:>8.1f}ms {after * 1000:>8.1f}ms {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Transaction Analyzer")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="comma-separated row counts (default: %(default)s)")
+    parser.add_argument('--format', choices=['xlsx', 'csv'], default='xlsx',
+                        help="statement file format; sizes over the Excel limit always use csv")
+    parser.add_argument('--workdir', default='benchmark-data', help="where statements are generated and cached")
+    parser.add_argument('--repeat', type=int, default=3, help="runs of each query stage, fastest is kept")
+    parser.add_argument('--clients', type=int, default=8, help="concurrent clients in the load test")
+    parser.add_argument('--requests', type=int, default=25, help="requests per client in the load test")
+    parser.add_argument('--no-load-test', action='store_true', help="only time the analyzer stages")
+    parser.add_argument('--output', default='benchmark-baseline.json', help="JSON file for the results")
+    parser.add_argument('--compare', help="earlier baseline to diff the results against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="relative change reported as a regression")
+    args = parser.parse_args(argv)
+
+    # The analyzer logs every load and request at INFO
+    logging.getLogger('analyze').setLevel(logging.WARNING)
+    analyze.app.config['DATASET_FOLDER'] = os.path.join(args.workdir, 'datasets')
+    analyze.app.config['ANALYZER_MEMORY_BUDGET'] = 1 << 40
+    analyze.registry.memory_budget = analyze.app.config['ANALYZER_MEMORY_BUDGET']
+
+    report = {
+        "version": BASELINE_VERSION,
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "orjson": analyze.HAS_ORJSON,
+            "pyarrow": analyze.HAS_PYARROW,
+            "compact_storage": analyze.app.config['COMPACT_STORAGE'],
+        },
+        "sizes": {}
+    }
+
+    for size in [int(size) for size in args.sizes.split(',') if size.strip()]:
+        path = statement_file(size, args.workdir, args.format)
+        logger.info(f"Benchmarking {size} rows from {path}")
+        entry = {"file": os.path.basename(path), "stages": benchmark_stages(path, args.repeat)}
+        if not args.no_load_test:
+            entry["load_test"] = load_test(path, args.clients, args.requests)
+        report["sizes"][str(size)] = entry
+
+    with open(args.output, 'w', encoding='utf-8') as output:
+        json.dump(report, output, indent=2, ensure_ascii=False)
+    logger.info(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as previous:
+            regressions = compare(json.load(previous), report, args.threshold)
+        if regressions:
+            print(f"\n{regressions} stage(s) slower by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,6 +14,10 @@ document.addEventListener('DOMContentLoaded', function () {
 let currentData = null;
 let categoryChart = null;
 let trendsChart = null;
+// Dataset this browser uploaded; the server's shared dataset is used until then
+let datasetId = localStorage.getItem('datasetId');
+// Last /filter response, reused when the server answers 304 Not Modified
+let lastFilter = null;
 
 // Pastel color palette for charts
 const pastelColors = [
@@ -145,46 +149,70 @@ function handleDrop(e) {
     e.preventDefault();
     uploadArea.classList.remove('dragover');
     const files = e.dataTransfer.files;
-    if (files.length > 0 && (files[0].name.endsWith('.xlsx') || files[0].name.endsWith('.xls'))) {
+    const isStatement = file => /\.(xlsx|xls|csv)$/i.test(file.name);
+    if (files.length > 0 && Array.from(files).every(isStatement)) {
         fileInput.files = files;
         handleFileSelect();
     } else {
-        showNotification('Please select a valid .xlsx or .xls file', 'error');
+        showNotification('Please select a valid .xlsx, .xls or .csv file', 'error');
     }
 }
 
 function handleFileSelect() {
-    const file = fileInput.files[0];
-    if (file) {
-        document.querySelector('.upload-content p').textContent = `Selected: ${file.name}`;
+    const files = fileInput.files;
+    if (files.length === 1) {
+        document.querySelector('.upload-content p').textContent = `Selected: ${files[0].name}`;
+    } else if (files.length > 1) {
+        document.querySelector('.upload-content p').textContent = `Selected: ${files.length} files`;
     }
 }
 
 async function handleUpload() {
-    const file = fileInput.files[0];
-    if (!file) {
+    const files = Array.from(fileInput.files);
+    if (files.length === 0) {
         showNotification('Please select a file first', 'error');
         return;
     }
 
     showLoading(true);
-    updateStatus('Uploading file...');
+    updateStatus(files.length > 1 ? `Uploading ${files.length} files...` : 'Uploading file...');
 
     const formData = new FormData();
-    formData.append('file', file);
+    // Several statements (one per account or month) are analyzed together
+    files.forEach(file => formData.append('file', file));
 
     try {
         const response = await fetch('/upload', {
             method: 'POST',
+            headers: datasetHeaders(),
             body: formData
         });
 
         const result = await response.json();
 
         if (response.ok) {
-            showNotification('File uploaded successfully!', 'success');
-            updateStatus('File uploaded. Loading analysis...');
-            await loadInitialData();
+            updateStatus('File uploaded. Processing...');
+            const job = await waitForJob(result.job_id);
+
+            if (job.state === 'done') {
+                datasetId = result.dataset_id;
+                localStorage.setItem('datasetId', datasetId);
+                showNotification('File uploaded successfully!', 'success');
+                const duplicates = job.load_report?.duplicates_dropped || 0;
+                if (duplicates > 0) {
+                    showNotification(`${formatNumber(duplicates)} transactions repeated across files were counted once`, 'info');
+                }
+                const failedDates = job.load_report?.failed_rows || 0;
+                if (failedDates > 0) {
+                    showNotification(`${formatNumber(failedDates)} dates could not be read and were left empty`, 'info');
+                }
+                currentData = job.result;
+                updateDashboard(currentData);
+                updateStatus(`Loaded ${currentData.transaction_count || 0} transactions successfully.`);
+            } else {
+                showNotification(`Upload failed: ${job.error}`, 'error');
+                updateStatus('Upload failed. Please try again.');
+            }
         } else {
             showNotification(`Upload failed: ${result.error}`, 'error');
             updateStatus('Upload failed. Please try again.');
@@ -198,12 +226,41 @@ async function handleUpload() {
     }
 }
 
+function datasetHeaders(headers = {}) {
+    return datasetId ? { ...headers, 'X-Dataset-Id': datasetId } : headers;
+}
+
+async function waitForJob(jobId) {
+    while (true) {
+        const response = await fetch(`/jobs/${jobId}`);
+        const job = await response.json();
+
+        if (!response.ok) {
+            return { state: 'failed', error: job.error };
+        }
+        if (job.state === 'done' || job.state === 'failed') {
+            return job;
+        }
+
+        const { rows = 0, total_rows: totalRows } = job.progress || {};
+        updateStatus(totalRows ? `Processing... ${formatNumber(rows)} of ${formatNumber(totalRows)} rows` : 'Processing...');
+        await new Promise(resolve => setTimeout(resolve, 500));
+    }
+}
+
 async function loadInitialData() {
     showLoading(true);
     updateStatus('Loading transaction data...');
 
     try {
-        const response = await fetch('/analyze');
+        const response = await fetch('/analyze', { headers: datasetHeaders() });
+
+        if (response.status === 404 && datasetId) {
+            // Our dataset is gone from the server, fall back to the shared one
+            datasetId = null;
+            localStorage.removeItem('datasetId');
+            return loadInitialData();
+        }
 
         if (response.ok) {
             currentData = await response.json();
@@ -523,16 +580,26 @@ async function applyFilters() {
     };
 
     try {
+        const body = JSON.stringify(filters);
+        const headers = { 'Content-Type': 'application/json' };
+        if (lastFilter && lastFilter.body === body && lastFilter.datasetId === datasetId && lastFilter.etag) {
+            headers['If-None-Match'] = lastFilter.etag;
+        }
+
         const response = await fetch('/filter', {
             method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(filters)
+            headers: datasetHeaders(headers),
+            body
         });
 
-        if (response.ok) {
-            const filteredData = await response.json();
+        if (response.ok || response.status === 304) {
+            let filteredData;
+            if (response.status === 304) {
+                filteredData = lastFilter.data;
+            } else {
+                filteredData = await response.json();
+                lastFilter = { body, datasetId, etag: response.headers.get('ETag'), data: filteredData };
+            }
             updateDashboard(filteredData);
             showNotification('Filters applied successfully!', 'success');
             updateStatus(`Filters applied. Showing ${filteredData.transaction_count || 0} transactions.`);
@@ -0,0 +1,340 @@
+"""
+Statement normalization shared by the web analyzer (analyze.py) and the
+desktop app (Python/payment/Payments.py): source column detection, date
+and time parsing with a per-load detected format, amount cleaning and
+keyword categorization.
+"""
+
+from pandas.tseries.api import guess_datetime_format
+import pandas as pd
+import numpy as np
+import json
+from datetime import date
+import re
+import logging
+import warnings
+
+logger = logging.getLogger(__name__)
+
+MISC_CATEGORY = "🔄 Miscellaneous"
+
+# Distinct details strings whose category KeywordCategorizer remembers
+CATEGORY_CACHE_SIZE = 200000
+# Date formats tried on a sample of each load, day-first (Indian bank exports) before month-first
+DATE_FORMATS = [
+    '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%d/%m/%y', '%d-%m-%y', '%d %b %Y', '%d-%b-%Y',
+    '%d-%b-%y', '%d %B %Y', '%Y-%m-%d', '%Y/%m/%d', '%m/%d/%Y', '%m-%d-%Y', '%b %d, %Y',
+    '%Y-%m-%d %H:%M:%S', '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d-%m-%Y %H:%M:%S'
+]
+TIME_FORMATS = ['%H:%M:%S', '%H:%M', '%I:%M:%S %p', '%I:%M %p', '%H:%M:%S.%f']
+# Distinct values sampled to pick a date format
+DATE_SAMPLE_SIZE = 200
+
+
+class KeywordCategorizer:
+    """Compiled keyword matcher that labels a whole details column at once.
+
+    Each category's keywords are folded into one regex alternation and the
+    categories are tried in keyword map order, so the first category
+    with any matching keyword wins - exactly like the per-row loop did.
+
+    Labels are memoized per normalized (lowercased, stripped) details
+    string, so each distinct merchant or payee is scanned once, however many
+    rows or loads repeat it. The memo and patterns are rebuilt whenever the
+    keyword map changes, including in-place edits.
+    """
+
+    def __init__(self, category_keywords, cache_size=CATEGORY_CACHE_SIZE):
+        self.category_keywords = category_keywords
+        self.cache_size = cache_size
+        self.cache = {}
+        self.fingerprint = None
+        self.patterns = []
+        self._refresh()
+
+    def _refresh(self):
+        """Recompile the patterns and drop the memo if the keyword map changed"""
+        fingerprint = json.dumps(self.category_keywords, ensure_ascii=False)
+        if fingerprint == self.fingerprint:
+            return
+        self.fingerprint = fingerprint
+        self.cache = {}
+        self.patterns = []
+        for category, keywords in self.category_keywords.items():
+            escaped = [re.escape(keyword.lower()) for keyword in keywords if keyword]
+            if escaped:
+                self.patterns.append((category, re.compile('|'.join(escaped))))
+
+    def categorize(self, details):
+        """Categorize a single details value"""
+        if pd.isna(details) or details == '' or str(details).lower() == 'nan':
+            return MISC_CATEGORY
+
+        self._refresh()
+        details_lower = str(details).lower().strip()
+        label = self.cache.get(details_lower)
+        if label is None:
+            label = MISC_CATEGORY
+            for category, pattern in self.patterns:
+                if pattern.search(details_lower):
+                    label = category
+                    break
+            self._remember([details_lower], [label])
+        return label
+
+    def _remember(self, keys, labels):
+        if len(self.cache) + len(keys) > self.cache_size:
+            self.cache = {}
+        self.cache.update(zip(keys, labels))
+
+    def _scan(self, details_lower):
+        """Labels for distinct lowercased strings in vectorized passes"""
+        labels = np.full(len(details_lower), MISC_CATEGORY, dtype=object)
+
+        # Only strings that no earlier category claimed are scanned again
+        pending = np.ones(len(details_lower), dtype=bool)
+        for category, pattern in self.patterns:
+            if not pending.any():
+                break
+            candidates = details_lower[pending]
+            hits = candidates.str.contains(pattern.pattern, regex=True, na=False).to_numpy()
+            positions = np.flatnonzero(pending)[hits]
+            labels[positions] = category
+            pending[positions] = False
+        return labels
+
+    def categorize_series(self, details):
+        """Label every value of a details Series, scanning each distinct string once"""
+        self._refresh()
+        # Normalize the distinct raw strings only; missing values get code -1
+        codes, uniques = pd.factorize(details)
+        uniques = pd.Series(uniques, dtype=object).astype(str).str.lower().str.strip()
+
+        unique_labels = uniques.map(self.cache).to_numpy(dtype=object)
+        unknown = pd.isna(unique_labels)
+        if unknown.any():
+            scanned = self._scan(uniques[unknown].reset_index(drop=True))
+            unique_labels[unknown] = scanned
+            self._remember(uniques[unknown], scanned)
+        unique_labels[(uniques == 'nan').to_numpy()] = MISC_CATEGORY
+
+        labels = np.full(len(codes), MISC_CATEGORY, dtype=object)
+        present = codes >= 0
+        labels[present] = unique_labels[codes[present]]
+        return pd.Series(labels, index=details.index, name=details.name)
+
+
+class DateParser:
+    """Parses a date (or time) column with one format detected per load.
+
+    The format is picked once, from a sample of distinct non-blank values:
+    the candidate that parses most of the sample wins, the earlier one on
+    ties. Year-day-month layouts are never considered, so ISO dates keep
+    their month and day in place.
+    Each distinct string is then parsed once in a vectorized pass and the
+    result spread back over the rows, so repeated dates cost nothing.
+    Values that are present but cannot be parsed are counted in failures.
+    """
+
+    def __init__(self, formats, sample_size=DATE_SAMPLE_SIZE):
+        self.formats = formats
+        self.sample_size = sample_size
+        self.format = None
+        self.detected = False
+        self.rows = 0
+        self.failures = 0
+        self.failure_examples = []
+
+    @staticmethod
+    def _field_order(fmt):
+        """Positions of the year, month and day directives in a format"""
+        def position(*directives):
+            found = [fmt.find(d) for d in directives if d in fmt]
+            return min(found) if found else None
+        return position('%Y', '%y'), position('%m', '%b', '%B'), position('%d')
+
+    @classmethod
+    def _day_first(cls, fmt):
+        """True when the day leads both the month and the year"""
+        year, month, day = cls._field_order(fmt)
+        return (day is not None and month is not None and day < month
+                and (year is None or day < year))
+
+    @classmethod
+    def _year_day_month(cls, fmt):
+        year, month, day = cls._field_order(fmt)
+        return None not in (year, month, day) and year < day < month
+
+    def _detect(self, uniques):
+        """Pick the format parsing most of a sample of the distinct values"""
+        self.detected = True
+        values = [value for value in uniques if value != '']
+        if len(values) == 0:
+            return
+        step = max(1, len(values) // self.sample_size)
+        sample = pd.Series(values[::step][:self.sample_size], dtype=object)
+
+        candidates = []
+        for value in sample[:5]:
+            # Year-first values only get the month-first guess, '%Y-%m-%d'
+            for dayfirst in (True, False):
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    guessed = guess_datetime_format(value, dayfirst=dayfirst)
+                if not guessed or guessed in candidates or self._year_day_month(guessed):
+                    continue
+                # The dayfirst guess only counts when the day really leads
+                if dayfirst and not self._day_first(guessed):
+                    continue
+                candidates.append(guessed)
+        candidates += [fmt for fmt in self.formats
+                       if fmt not in candidates and not self._year_day_month(fmt)]
+
+        best, best_count = None, 0
+        for fmt in candidates:
+            count = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+            if count > best_count:
+                best, best_count = fmt, count
+                if count == len(sample):
+                    break
+        self.format = best
+        if best is None:
+            logger.warning(f"No date format matched values like {list(sample[:3])}")
+        else:
+            logger.info(f"Detected date format {best} ({best_count} of {len(sample)} sampled values)")
+
+    def parse(self, values):
+        """datetime64 Series for a column of strings, datetimes or a mix"""
+        self.rows += len(values)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+
+        codes, uniques = pd.factorize(values)
+        uniques = np.asarray(uniques, dtype=object)
+        parsed = np.full(len(uniques), np.datetime64('NaT'), dtype='datetime64[us]')
+
+        # Excel date cells arrive as datetimes; everything else is parsed as text
+        native = np.array([isinstance(value, (date, np.datetime64)) for value in uniques], dtype=bool)
+        if native.any():
+            parsed[native] = pd.to_datetime(uniques[native], errors='coerce').to_numpy().astype('datetime64[us]')
+
+        text = pd.Index([str(value).strip() for value in uniques[~native]], dtype=object)
+        if len(text) > 0:
+            if not self.detected:
+                self._detect(text)
+            if self.format is not None:
+                parsed_text = pd.to_datetime(text, format=self.format, errors='coerce')
+            else:
+                parsed_text = pd.to_datetime(text, format='mixed', dayfirst=True, errors='coerce')
+            parsed[~native] = parsed_text.to_numpy().astype('datetime64[us]')
+
+            # Blank cells are missing values, not failed parses
+            blank = np.zeros(len(uniques), dtype=bool)
+            blank[~native] = np.asarray(text == '')
+            failed = np.isnat(parsed) & ~native & ~blank
+            if failed.any():
+                self.failures += int(failed[codes[codes >= 0]].sum())
+                room = 5 - len(self.failure_examples)
+                if room > 0:
+                    self.failure_examples += [str(value) for value in uniques[failed][:room]]
+
+        result = parsed[codes]
+        result[codes < 0] = np.datetime64('NaT')
+        return pd.Series(result, index=values.index)
+
+
+def detect_columns(frame):
+    """Find the source columns for DateTime, Amount and Transaction Details"""
+    columns = {'date': None, 'time': None, 'amount': None, 'details': None}
+    
+    # Look for Date and Time columns separately and combine them
+    for col in frame.columns:
+        col_lower = col.lower().strip()
+        if col_lower == 'date':
+            columns['date'] = col
+        elif col_lower == 'time':
+            columns['time'] = col
+        elif 'datetime' in col_lower:
+            columns['date'] = col
+            break
+    
+    for col in frame.columns:
+        if 'amount' in col.lower():
+            columns['amount'] = col
+            break
+    
+    for col in frame.columns:
+        col_lower = col.lower()
+        if 'transaction' in col_lower and 'detail' in col_lower:
+            columns['details'] = col
+            break
+    
+    if columns['details'] is None:
+        # Use first available text column
+        text_cols = [col for col in frame.columns if frame[col].dtype == 'object']
+        if len(text_cols) > 0:
+            columns['details'] = text_cols[0]
+            logger.info(f"Used {text_cols[0]} as Transaction Details")
+        else:
+            logger.warning("No transaction details found, using dummy data")
+    
+    if columns['date'] is not None and columns['time'] is not None:
+        logger.info(f"Combining {columns['date']} and {columns['time']} into DateTime")
+    elif columns['date'] is not None:
+        logger.info(f"Converting {columns['date']} to DateTime")
+    else:
+        logger.warning("No date column found, creating dummy dates")
+    
+    if columns['amount'] is not None:
+        logger.info(f"Converting {columns['amount']} to numeric Amount")
+    else:
+        logger.warning("No amount column found, setting all amounts to 0")
+    
+    return columns
+
+
+def parse_datetimes(frame, columns):
+    """DateTime for a raw frame from its date and time columns, or None without a date column.
+    
+    Dates and times are parsed separately with DateParsers kept in
+    columns, so the formats are detected once per load and every chunk
+    of a file uses them. Unparseable values become NaT and are counted
+    rather than replaced.
+    """
+    date_col, time_col = columns['date'], columns['time']
+    if date_col is None:
+        return None
+    
+    date_parser = columns.setdefault('date_parser', DateParser(DATE_FORMATS))
+    dates = date_parser.parse(frame[date_col])
+    if time_col is None:
+        return dates
+    
+    time_parser = columns.setdefault('time_parser', DateParser(TIME_FORMATS))
+    times = time_parser.parse(frame[time_col])
+    return dates.dt.normalize() + (times - times.dt.normalize())
+
+
+def date_report(columns):
+    """Detected formats, failed row count and a few failed values of a load"""
+    report = {"date_format": None, "time_format": None, "failed_rows": 0, "examples": []}
+    for kind in ('date', 'time'):
+        parser = columns.get(f'{kind}_parser')
+        if parser is None:
+            continue
+        report[f"{kind}_format"] = parser.format
+        report["failed_rows"] += parser.failures
+        report["examples"] += parser.failure_examples
+    return report
+
+
+def clean_amounts(values):
+    """Numeric amounts from a raw column; currency symbols, commas and spaces are dropped, blanks become 0"""
+    amount_series = values.astype(str)
+    # Remove currency symbols and whitespace
+    amount_series = amount_series.str.replace(r'[₹,$,\s]', '', regex=True)
+    # Handle empty strings
+    amount_series = amount_series.replace('', '0')
+    amount_series = amount_series.replace('nan', '0')
+    # Fill any remaining NaN values with 0
+    return pd.to_numeric(amount_series, errors='coerce').fillna(0)